@@ -1,15 +1,24 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
-import importlib
-import os
-import sys
-from datetime import datetime
+import time
 
-from cloudshell.core.logger.qs_logger import get_qs_logger
-from cloudshell.layer_one.core.command_executor import CommandExecutor
-from cloudshell.layer_one.core.driver_listener import DriverListener
-from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
-from cloudshell.layer_one.core.helper.xml_logger import XMLLogger
+# taken before the other imports, so the startup report includes the module import time
+START_TIME = time.time()
+
+import importlib  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from cloudshell.core.logger.qs_logger import get_qs_logger  # noqa: E402
+from cloudshell.layer_one.core.command_executor import CommandExecutor  # noqa: E402
+from cloudshell.layer_one.core.driver_listener import DriverListener  # noqa: E402
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration  # noqa: E402
+from cloudshell.layer_one.core.helper.xml_logger import XMLLogger  # noqa: E402
+
+from telebyte.helpers.sharded_executor import ShardedCommandExecutor  # noqa: E402
+from telebyte.helpers.startup_report import StartupReport  # noqa: E402
+from telebyte.helpers.tracing import Tracer, TracingCommandExecutor, TracingXMLLogger  # noqa: E402
 
 
 class Main(object):
@@ -18,34 +27,55 @@ class Main(object):
         self._port = port
         self._log_path = log_path or os.path.join(self._driver_path, '..', 'Logs')
         os.environ['LOG_PATH'] = self._log_path
+        self._startup_report = StartupReport(START_TIME)
 
     def run_driver(self, driver_name):
-        # Reading runtime configuration
-        runtime_config = RuntimeConfiguration(
-            os.path.join(self._driver_path, driver_name + '_runtime_config.yml'))
+        # Reading runtime configuration, the parsed instance is passed to everything that needs it
+        config_path = os.path.join(self._driver_path, driver_name + '_runtime_config.yml')
+        with self._startup_report.phase('config'):
+            runtime_config = RuntimeConfiguration(config_path)
 
-        # Creating XMl logger instance
-        xml_file_name = driver_name + '--' + datetime.now().strftime('%d-%b-%Y--%H-%M-%S') + '.xml'
-        xml_logger = XMLLogger(os.path.join(self._log_path, driver_name, xml_file_name))
+        with self._startup_report.phase('loggers'):
+            # Creating XMl logger instance
+            xml_file_name = driver_name + '--' + datetime.now().strftime('%d-%b-%Y--%H-%M-%S') + '.xml'
+            xml_logger = XMLLogger(os.path.join(self._log_path, driver_name, xml_file_name))
 
-        # Creating command logger instance
-        command_logger = get_qs_logger(log_group=driver_name,
-                                       log_file_prefix=driver_name + '_commands', log_category='COMMANDS')
-        log_level = runtime_config.read_key('LOGGING.LEVEL', 'INFO')
-        command_logger.setLevel(log_level)
+            # Creating command logger instance
+            command_logger = get_qs_logger(log_group=driver_name,
+                                           log_file_prefix=driver_name + '_commands', log_category='COMMANDS')
+            log_level = runtime_config.read_key('LOGGING.LEVEL', 'INFO')
+            command_logger.setLevel(log_level)
 
         command_logger.info('Starting driver {0} on port {1}, PID: {2}'.format(driver_name, self._port, os.getpid()))
 
-        # Importing and creating driver commands instance
-        driver_commands = importlib.import_module('{}.driver_commands'.format(driver_name), package=None)
-        driver_instance = driver_commands.DriverCommands(command_logger, runtime_config)
+        workers_count = runtime_config.read_key('DRIVER.WORKERS', 0)
+        if workers_count:
+            # Starting worker processes, each one creates its own driver commands instance
+            command_logger.info('Starting {} worker processes'.format(workers_count))
+            with self._startup_report.phase('workers'):
+                command_executor = ShardedCommandExecutor(driver_name, config_path, self._log_path, workers_count,
+                                                          command_logger)
+        else:
+            # Importing and creating driver commands instance, CLI transports are imported on first connection
+            with self._startup_report.phase('driver_import'):
+                driver_commands = importlib.import_module('{}.driver_commands'.format(driver_name), package=None)
+            with self._startup_report.phase('driver_init'):
+                driver_instance = driver_commands.DriverCommands(command_logger, runtime_config)
 
-        # Creating command executor instance
-        command_executor = CommandExecutor(driver_instance, command_logger)
+            # Creating command executor instance
+            command_executor = CommandExecutor(driver_instance, command_logger)
+
+        tracer = Tracer(command_logger, runtime_config, driver_name, self._log_path)
+        if tracer.enabled:
+            # Request traces start when request XML is logged and are saved when response XML is logged
+            command_executor = TracingCommandExecutor(command_executor, tracer)
+            xml_logger = TracingXMLLogger(xml_logger, tracer)
 
         # Creating listener instance
         server = DriverListener(command_executor, xml_logger, command_logger)
 
+        command_logger.info(self._startup_report.report())
+
         # Start listening
         server.start_listening(port=self._port)
 
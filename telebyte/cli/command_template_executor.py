@@ -0,0 +1,21 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from cloudshell.cli.command_template.command_template_executor import CommandTemplateExecutor
+
+
+class TelebyteCommandTemplateExecutor(CommandTemplateExecutor):
+    """ Command template executor passing the template to TelebyteCliService, commands are tracked per template """
+
+    def execute_command(self, **command_kwargs):
+        """
+        Execute command
+        :param command_kwargs:
+        :return: Command output
+        :rtype: str
+        """
+
+        command = self._command_template.prepare_command(**command_kwargs)
+        return self._cli_service.send_command(command, action_map=self.action_map, error_map=self.error_map,
+                                              command_template=self._command_template._command,
+                                              **self.optional_kwargs)
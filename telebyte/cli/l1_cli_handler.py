@@ -1,38 +1,100 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import importlib
+import os
+from contextlib import contextmanager
+
 from cloudshell.cli.cli import CLI
-from cloudshell.cli.session.ssh_session import SSHSession
-from cloudshell.cli.session.telnet_session import TelnetSession
 from cloudshell.cli.session_pool_manager import SessionPoolManager
 from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
 from cloudshell.layer_one.core.layer_one_driver_exception import LayerOneDriverException
 
+from telebyte.cli.racing_session_manager import RacingSessionManager
+from telebyte.cli.session_recorder import recording_session_class
+from telebyte.cli.telebyte_cli_service import TelebyteCliService
+from telebyte.helpers.latency_tracker import LatencyTracker
+from telebyte.helpers.rate_limiter import RateLimiter
+from telebyte.helpers.tracing import close_span, open_span
+
 
 class L1CliHandler(object):
-    def __init__(self, logger):
+    SESSIONS = 1
+    # session classes are imported when the session type is used first, SSH pulls in paramiko
+    SESSION_TYPES = {'SSH': 'cloudshell.cli.session.ssh_session.SSHSession',
+                     'TELNET': 'cloudshell.cli.session.telnet_session.TelnetSession',
+                     'REPLAY': 'telebyte.cli.replay_session.ReplaySession',
+                     'SIMULATOR': 'telebyte.cli.simulator_session.SimulatorSession'}
+    NOT_RECORDED_TYPES = ('REPLAY', 'SIMULATOR')
+
+    def __init__(self, logger, runtime_config=None, latency_tracker=None, rate_limiter=None, transport_cache=None):
+        """
+        :type logger: logging.Logger
+        :param runtime_config: parsed runtime configuration, the process wide instance by default
+        :type runtime_config: RuntimeConfiguration
+        :param latency_tracker: command latency statistics, may be shared by several handlers
+        :type latency_tracker: LatencyTracker
+        :param rate_limiter: per chassis limits, should be shared by all handlers of the process
+        :type rate_limiter: RateLimiter
+        :param transport_cache: session types that connected to each chassis, may be shared by several handlers
+        :type transport_cache: telebyte.cli.racing_session_manager.TransportCache
+        """
+
         self._logger = logger
-        self._cli = CLI(session_pool=SessionPoolManager(max_pool_size=1))
-        self._defined_session_types = {'SSH': SSHSession, 'TELNET': TelnetSession}
+        runtime_config = runtime_config or RuntimeConfiguration()
+        # each handler has its own pool and session manager, so CLI.SESSIONS limits the sessions of one handler,
+        # the sampler handler opens its sessions in addition to the driver ones
+        self._cli = CLI(session_pool=SessionPoolManager(
+            session_manager=RacingSessionManager(transport_cache),
+            max_pool_size=int(runtime_config.read_key('CLI.SESSIONS', self.SESSIONS))))
+        self._session_classes = {}
+
+        self._session_types = runtime_config.read_key('CLI.TYPE') or list(self.SESSION_TYPES)
+        self._ports = runtime_config.read_key('CLI.PORTS', {})
 
-        self._session_types = RuntimeConfiguration().read_key(
-            'CLI.TYPE') or self._defined_session_types.keys()
-        self._ports = RuntimeConfiguration().read_key('CLI.PORTS')
+        self._latency_tracker = latency_tracker or LatencyTracker(runtime_config)
+        self._rate_limiter = rate_limiter or RateLimiter(runtime_config)
+        self._capture_folder = None
+        if runtime_config.read_key('CLI.RECORD', False):
+            self._capture_folder = os.path.join(os.environ.get('LOG_PATH', '.'), 'telebyte', 'captures')
+        # session defaults apply to the options missing in the config
+        self._session_kwargs = {
+            'REPLAY': {'capture_file': runtime_config.read_key('CLI.REPLAY.FILE'),
+                       'timing': runtime_config.read_key('CLI.REPLAY.TIMING'),
+                       'speed': runtime_config.read_key('CLI.REPLAY.SPEED')},
+            'SIMULATOR': {'slots': runtime_config.read_key('CLI.SIMULATOR.SLOTS'),
+                          'latency': runtime_config.read_key('CLI.SIMULATOR.LATENCY')}}
 
         self._host = None
         self._username = None
         self._password = None
 
+    def _get_session_class(self, session_type):
+        """ Import session class of the type
+        :raises LayerOneDriverException: if session type is not defined
+        """
+
+        if session_type not in self._session_classes:
+            class_path = self.SESSION_TYPES.get(session_type)
+            if not class_path:
+                raise LayerOneDriverException(self.__class__.__name__,
+                                              'Session type {} is not defined'.format(session_type))
+            module_name, class_name = class_path.rsplit('.', 1)
+            session_class = getattr(importlib.import_module(module_name), class_name)
+            if self._capture_folder and session_type not in self.NOT_RECORDED_TYPES:
+                session_class = recording_session_class(session_class, self._capture_folder)
+            self._session_classes[session_type] = session_class
+        return self._session_classes[session_type]
+
     def _new_sessions(self):
         sessions = []
         for session_type in self._session_types:
-            session_class = self._defined_session_types.get(session_type)
-            if not session_class:
-                raise LayerOneDriverException(self.__class__.__name__,
-                                              'Session type {} is not defined'.format(session_type))
+            session_class = self._get_session_class(session_type)
             port = self._ports.get(session_type)
-            self._logger.info("SSH CONNECTION PORT: {}".format(port))
-            sessions.append(session_class(self._host, self._username, self._password, port))
+            self._logger.info("{} CONNECTION PORT: {}".format(session_type, port))
+            session_kwargs = {key: value for key, value in self._session_kwargs.get(session_type, {}).items()
+                              if value is not None}
+            sessions.append(session_class(self._host, self._username, self._password, port, **session_kwargs))
         return sessions
 
     def define_session_attributes(self, address, username, password):
@@ -52,6 +114,7 @@ class L1CliHandler(object):
         self._username = username
         self._password = password
 
+    @contextmanager
     def get_cli_service(self, command_mode):
         """
         Create new cli service or get it from pool
@@ -61,4 +124,14 @@ class L1CliHandler(object):
         if not self._host or not self._username or not self._password:
             raise LayerOneDriverException(self.__class__.__name__,
                                           "Cli Attributes is not defined, call Login command first")
-        return self._cli.get_session(self._new_sessions(), command_mode, self._logger)
+        host = self._host
+        with self._rate_limiter.session(host):
+            # session connect span is added while the session is acquired, so it is a child of this one
+            acquire_span = open_span("session_acquire")
+            try:
+                with self._cli.get_session(self._new_sessions(), command_mode, self._logger) as cli_service:
+                    close_span(acquire_span)
+                    yield TelebyteCliService(cli_service, host, self._latency_tracker, self._rate_limiter,
+                                             self._logger)
+            finally:
+                close_span(acquire_span)
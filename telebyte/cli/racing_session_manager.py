@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+from threading import Lock, Thread
+
+from cloudshell.cli.session_manager_impl import SessionManagerImpl, SessionManagerException
+
+from telebyte.helpers.tracing import record_span
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+
+class TransportCache(object):
+    """ Session type and port of the last successful connection per chassis address """
+
+    def __init__(self):
+        self._transports = {}
+        self._lock = Lock()
+
+    def get(self, host):
+        """
+        :return: session type and port, None if the chassis was not connected yet
+        :rtype: tuple
+        """
+
+        return self._transports.get(host)
+
+    def remember(self, host, session_type, port):
+        with self._lock:
+            self._transports[host] = (session_type, port)
+
+    def forget(self, host):
+        with self._lock:
+            self._transports.pop(host, None)
+
+
+class RacingSessionManager(SessionManagerImpl):
+    """ Session manager connecting all configured session types at the same time
+
+    The first connected session is used and the others are disconnected as soon as they connect.
+    The winning session type is remembered per chassis, later sessions connect with it directly,
+    the race is repeated only if it fails.
+    """
+
+    def __init__(self, transport_cache=None):
+        """
+        :param transport_cache: winning transports, may be shared by several session managers
+        :type transport_cache: TransportCache
+        """
+
+        super(RacingSessionManager, self).__init__()
+        self._transport_cache = transport_cache or TransportCache()
+
+    def new_session(self, new_sessions, prompt, logger):
+        """ Create new session
+        :param new_sessions: sessions of the configured types
+        :type new_sessions: list
+        :param prompt:
+        :param logger:
+        :raises SessionManagerException: if no session could connect
+        """
+
+        if not isinstance(new_sessions, list):
+            new_sessions = [new_sessions]
+
+        start_time = time.time()
+        session = self._get_remembered(new_sessions)
+        if session is not None:
+            try:
+                session.connect(prompt, logger)
+            except Exception as e:
+                logger.debug("Remembered {} session failed to connect to {}: {}".format(
+                    session.session_type, session.host, e))
+                self._transport_cache.forget(session.host)
+                new_sessions = [new_session for new_session in new_sessions if new_session is not session]
+                session = None
+
+        if session is None:
+            session = self._race(new_sessions, prompt, logger)
+        if session is None:
+            raise SessionManagerException(self.__class__.__name__,
+                                          "Failed to create new session for type {}, see logs for details".format(
+                                              ", ".join(new_session.session_type for new_session in new_sessions)))
+
+        record_span("session_connect", start_time, detail=session.session_type)
+        logger.debug("Created new {} session".format(session.session_type))
+        self._transport_cache.remember(session.host, session.session_type, session.port)
+        self._existing_sessions.append(session)
+        return session
+
+    def _get_remembered(self, new_sessions):
+        for session in new_sessions:
+            if self._transport_cache.get(session.host) == (session.session_type, session.port):
+                return session
+        return None
+
+    @staticmethod
+    def _race(new_sessions, prompt, logger):
+        """ Connect all sessions in parallel
+        :return: the first connected session, None if all of them failed
+        """
+
+        if not new_sessions:
+            return None
+        if len(new_sessions) == 1:
+            try:
+                new_sessions[0].connect(prompt, logger)
+                return new_sessions[0]
+            except Exception as e:
+                logger.debug("{} session failed to connect: {}".format(new_sessions[0].session_type, e))
+                return None
+
+        results = Queue()
+        winner = []
+        lock = Lock()
+
+        def connect(session):
+            try:
+                session.connect(prompt, logger)
+            except Exception as e:
+                logger.debug("{} session failed to connect to {}: {}".format(session.session_type, session.host, e))
+                results.put(None)
+                return
+
+            with lock:
+                won = not winner
+                winner.append(session)
+            if won:
+                results.put(session)
+                return
+
+            logger.debug("{} session connected after the winner, disconnecting".format(session.session_type))
+            try:
+                session.disconnect()
+            except Exception as e:
+                logger.debug("Failed to disconnect {} session: {}".format(session.session_type, e))
+
+        for session in new_sessions:
+            thread = Thread(target=connect, args=(session,), name="connect-{}".format(session.session_type))
+            thread.daemon = True
+            thread.start()
+
+        # a failed session puts None, the winner puts itself, the late sessions nothing
+        for _ in new_sessions:
+            session = results.get()
+            if session is not None:
+                return session
+        return None
@@ -0,0 +1,131 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import time
+from collections import OrderedDict
+
+from cloudshell.cli.session.connection_params import ConnectionParams
+from cloudshell.cli.session.expect_session import ExpectSession
+from cloudshell.cli.session.session_exceptions import SessionException, SessionReadTimeout
+
+from telebyte.cli.session_recorder import SEND, RECEIVE, REDACTED
+
+
+class ReplaySessionException(SessionException):
+    pass
+
+
+class ReplaySession(ExpectSession, ConnectionParams):
+    """ Fake session answering from the capture written by the recording session
+
+    Timing modes:
+        ORIGINAL - answers are delayed as they were in the captured session
+        COMPRESSED - captured delays are divided by the speed factor
+        NONE - answers are returned immediately
+
+    Login and password prompts of Telnet captures are answered while connecting, the captured
+    answers are REDACTED and match any username and password.
+    """
+
+    SESSION_TYPE = 'REPLAY'
+    TIMING_ORIGINAL = 'ORIGINAL'
+    TIMING_COMPRESSED = 'COMPRESSED'
+    TIMING_NONE = 'NONE'
+    IDLE_TIMEOUT = 0.01
+
+    def __init__(self, host, username, password, port=None, capture_file=None, timing=TIMING_ORIGINAL, speed=1,
+                 on_session_start=None, *args, **kwargs):
+        ConnectionParams.__init__(self, host, port=port, on_session_start=on_session_start)
+        ExpectSession.__init__(self, *args, **kwargs)
+        self.username = username
+        self.password = password
+        self.capture_file = capture_file
+
+        timing = (timing or self.TIMING_ORIGINAL).upper()
+        if timing == self.TIMING_NONE:
+            self._time_scale = 0
+        elif timing == self.TIMING_COMPRESSED:
+            self._time_scale = 1.0 / float(speed)
+        else:
+            self._time_scale = 1.0
+
+        self._events = None
+        self._position = 0
+        self._capture_time = 0
+        self._replay_time = 0
+
+    def __eq__(self, other):
+        return ConnectionParams.__eq__(self, other) and self.capture_file == other.capture_file
+
+    @staticmethod
+    def load_capture(capture_file):
+        """ Read capture events
+        :return: list of (time offset, direction, data)
+        :rtype: list[tuple]
+        """
+
+        events = []
+        with open(capture_file) as capture:
+            for line in capture:
+                record = json.loads(line)
+                if "dir" not in record:
+                    continue
+                data = record["data"]
+                if not isinstance(data, str):
+                    data = data.encode("utf-8")
+                events.append((record["t"], record["dir"], data))
+        return events
+
+    def _initialize_session(self, prompt, logger):
+        if not self.capture_file:
+            raise ReplaySessionException(self.__class__.__name__, "Capture file is not defined")
+
+        if self._events is None:
+            self._events = self.load_capture(self.capture_file)
+        self._position = 0
+        self._capture_time = 0
+        self._replay_time = time.time()
+
+    def _connect_actions(self, prompt, logger):
+        action_map = OrderedDict()
+        action_map['[Ll]ogin:|[Uu]ser:|[Uu]sername:'] = lambda session, logger: session.send_line(session.username,
+                                                                                                  logger)
+        action_map['[Pp]assword:'] = lambda session, logger: session.send_line(session.password, logger)
+        self.hardware_expect(None, expected_string=prompt, timeout=self._timeout, logger=logger,
+                             action_map=action_map)
+        self._on_session_start(logger)
+
+    def disconnect(self):
+        self._active = False
+
+    def _send(self, command, logger):
+        """ Move to the captured send of the same command """
+
+        for position in range(self._position, len(self._events)):
+            capture_time, direction, data = self._events[position]
+            if direction == SEND and (data.strip() == command.strip() or data == REDACTED and not self._active):
+                self._position = position + 1
+                self._capture_time = capture_time
+                self._replay_time = time.time()
+                return
+
+        raise ReplaySessionException(self.__class__.__name__,
+                                     "Command '{}' is not found in the capture".format(command.strip()))
+
+    def _receive(self, timeout, logger):
+        """ Return the next captured answer when it is due, device is silent until the next send """
+
+        timeout = timeout if timeout else self._timeout
+        if self._position < len(self._events):
+            capture_time, direction, data = self._events[self._position]
+            if direction == RECEIVE:
+                delay = self._replay_time + (capture_time - self._capture_time) * self._time_scale - time.time()
+                if delay <= timeout:
+                    if delay > 0:
+                        time.sleep(delay)
+                    self._position += 1
+                    return data
+
+        time.sleep(timeout if self._time_scale else min(timeout, self.IDLE_TIMEOUT))
+        raise SessionReadTimeout()
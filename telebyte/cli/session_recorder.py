@@ -0,0 +1,110 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import time
+from datetime import datetime
+from threading import Lock
+
+SEND = "send"
+RECEIVE = "receive"
+REDACTED = "<redacted>"
+
+
+def _to_text(data):
+    if isinstance(data, type(u"")):
+        return data
+    return data.decode("utf-8", "replace")
+
+
+class SessionRecorder(object):
+    """ Write CLI conversation to the capture file, one JSON record per line
+
+    First line is a header {"host", "session_type", "start"}, next lines are
+    events {"t": seconds since start, "dir": "send"/"receive", "data": text}
+    """
+
+    def __init__(self, capture_path, host, session_type):
+        self._start_time = time.time()
+        self._lock = Lock()
+
+        capture_folder = os.path.dirname(capture_path)
+        if capture_folder and not os.path.isdir(capture_folder):
+            os.makedirs(capture_folder)
+        self._capture_file = open(capture_path, "a")
+        self._write({"host": host, "session_type": session_type, "start": self._start_time})
+
+    @staticmethod
+    def capture_path(capture_folder, host, session_type):
+        file_name = "{}--{}--{}.jsonl".format(host, session_type,
+                                              datetime.now().strftime("%d-%b-%Y--%H-%M-%S-%f"))
+        return os.path.join(capture_folder, file_name)
+
+    def _write(self, record):
+        with self._lock:
+            if self._capture_file:
+                self._capture_file.write(json.dumps(record) + "\n")
+                self._capture_file.flush()
+
+    def record(self, direction, data):
+        self._write({"t": round(time.time() - self._start_time, 6), "dir": direction, "data": _to_text(data)})
+
+    def close(self):
+        with self._lock:
+            if self._capture_file:
+                self._capture_file.close()
+                self._capture_file = None
+
+
+_recording_classes = {}
+
+
+def recording_session_class(session_class, capture_folder):
+    """ Subclass of the session type writing everything sent and received to the capture folder
+
+    Sends made while connecting, like Telnet username and password, are recorded as REDACTED.
+    Classes are cached, session pool compares sessions by their class
+    :param session_class: SSHSession, TelnetSession, etc.
+    :param capture_folder: folder for capture files
+    """
+
+    key = (session_class, capture_folder)
+    if key not in _recording_classes:
+        class RecordingSession(session_class):
+            def _initialize_session(self, prompt, logger):
+                self._recorder = SessionRecorder(SessionRecorder.capture_path(capture_folder, self.host,
+                                                                              self.session_type),
+                                                 self.host, self.session_type)
+                super(RecordingSession, self)._initialize_session(prompt, logger)
+
+            def connect(self, prompt, logger):
+                self._connecting = True
+                try:
+                    super(RecordingSession, self).connect(prompt, logger)
+                finally:
+                    self._connecting = False
+
+            def _send(self, command, logger):
+                recorder = getattr(self, "_recorder", None)
+                if recorder:
+                    recorder.record(SEND, REDACTED if getattr(self, "_connecting", False) else command)
+                super(RecordingSession, self)._send(command, logger)
+
+            def _receive(self, timeout, logger):
+                data = super(RecordingSession, self)._receive(timeout, logger)
+                recorder = getattr(self, "_recorder", None)
+                if recorder:
+                    recorder.record(RECEIVE, data)
+                return data
+
+            def disconnect(self):
+                recorder = getattr(self, "_recorder", None)
+                if recorder:
+                    recorder.close()
+                super(RecordingSession, self).disconnect()
+
+        RecordingSession.__name__ = "Recording{}".format(session_class.__name__)
+        _recording_classes[key] = RecordingSession
+
+    return _recording_classes[key]
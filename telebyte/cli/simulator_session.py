@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from cloudshell.cli.session.connection_params import ConnectionParams
+from cloudshell.cli.session.expect_session import ExpectSession
+from cloudshell.cli.session.session_exceptions import SessionReadTimeout
+
+from telebyte.helpers.port_index import PortIndex
+
+
+class SimulatedChassis(object):
+    """ Telebyte chassis state shared by all simulator sessions of the same host """
+
+    SYSTEM_MODEL = "600-6SL"
+    SOFTWARE = "Mux-2.6.0.1"
+
+    def __init__(self, slots):
+        """
+        :param slots: module P/N for each slot, empty value for an empty slot
+        :type slots: list[str]
+        """
+
+        self.lock = Lock()
+        self.slots = OrderedDict()
+        for slot_id, model in enumerate(slots, 1):
+            match = re.search(r"(?P<out_ports>\d+)-\d+-(?P<in_ports>\d+)", model or "")
+            if not match:
+                self.slots[slot_id] = None
+                continue
+
+            out_ports = int(match.group("out_ports"))
+            self.slots[slot_id] = {"model": model,
+                                   "serial": "TB{:04d}".format(8128 + slot_id),
+                                   "in_ports": int(match.group("in_ports")),
+                                   "connections": OrderedDict((PortIndex.out_port_name(i), 0)
+                                                              for i in range(1, out_ports + 1))}
+
+    def _get_slot(self, slot_id):
+        if not slot_id.isdigit() or int(slot_id) not in self.slots:
+            return None, "ERROR  Invalid Slot Number"
+        slot = self.slots[int(slot_id)]
+        if slot is None:
+            return None, "ERROR  Module Not Found"
+        return slot, None
+
+    def execute(self, command):
+        """ Execute Telebyte CLI command and return its output """
+
+        args = command.split()
+        with self.lock:
+            if args == ["show", "system", "software"]:
+                return "ACCEPTED  {}\n\n\"software\" {}\n".format(command, self.SOFTWARE)
+
+            if args == ["show", "sys-id"]:
+                return ("ACCEPTED SUCCESSFULLY\n\nSystem P/N: {}\nSystem Rev: A\nSystem S/N: TB8216\n"
+                        "Carrier P/N: 0519-0727\nCarrier Rev: C\nCarrier S/N: SUB1453\n"
+                        "SBC P/N: TS4200\nSBC Rev: E\nSBC S/N: 4EFF30\n").format(self.SYSTEM_MODEL)
+
+            if len(args) == 3 and args[:2] == ["show", "slot-id"]:
+                slot, error = self._get_slot(args[2])
+                if error:
+                    return error
+                return "ACCEPTED  {}\n\nSlot: {}\n  PN: {}\n  Rev: A.1\n  SN: {}\n".format(
+                    command, args[2], slot["model"], slot["serial"])
+
+            if len(args) == 4 and args[:2] == ["show", "con"] and args[3] == "all":
+                slot, error = self._get_slot(args[2])
+                if error:
+                    return error
+                return "ACCEPTED  {}\n\nSlot: {}\n{}\n".format(command, args[2], "\n".join(
+                    "{}:{};".format(out_port, in_port) for out_port, in_port in slot["connections"].items()))
+
+            if len(args) == 4 and args[0] == "set" and args[1] in ("con", "term"):
+                slot, error = self._get_slot(args[2])
+                if error:
+                    return error
+
+                if args[1] == "con":
+                    out_port, _, in_port = args[3].upper().partition(":")
+                    if not in_port.isdigit() or not 0 < int(in_port) <= slot["in_ports"]:
+                        return "ERROR  Invalid Input Channel"
+                    in_port = int(in_port)
+                else:
+                    out_port, in_port = args[3].upper(), 0
+
+                if out_port not in slot["connections"]:
+                    return "ERROR  Invalid Output"
+                slot["connections"][out_port] = in_port
+                return "ACCEPTED  {}".format(command.lower())
+
+        return "ERROR  Invalid Command"
+
+
+class SimulatorSession(ExpectSession, ConnectionParams):
+    """ Fake session emulating Telebyte CLI, used for load and performance testing without a device """
+
+    SESSION_TYPE = 'SIMULATOR'
+    SLOTS = ["600-SM-16-1-2"]
+    LATENCY = 0.05
+
+    _chassis = {}
+    _chassis_lock = Lock()
+
+    def __init__(self, host, username, password, port=None, slots=None, latency=LATENCY, on_session_start=None,
+                 *args, **kwargs):
+        """
+        :param slots: module P/N for each slot of the simulated chassis
+        :param latency: seconds the simulated device spends on each command
+        """
+
+        ConnectionParams.__init__(self, host, port=port, on_session_start=on_session_start)
+        ExpectSession.__init__(self, *args, **kwargs)
+        self.username = username
+        self.password = password
+        self._slots = slots or self.SLOTS
+        self._latency = float(latency or 0)
+        self._prompt = "{}:~$ ".format(SimulatedChassis.SYSTEM_MODEL)
+        self._input = ""
+        self._output = ""
+        self._output_time = 0
+
+    @classmethod
+    def get_chassis(cls, host, slots):
+        with cls._chassis_lock:
+            if host not in cls._chassis:
+                cls._chassis[host] = SimulatedChassis(slots)
+            return cls._chassis[host]
+
+    def _initialize_session(self, prompt, logger):
+        self._chassis_state = self.get_chassis(self.host, self._slots)
+        self._input = ""
+        self._output = self._prompt
+        self._output_time = time.time()
+
+    def _connect_actions(self, prompt, logger):
+        self.hardware_expect(None, expected_string=prompt, timeout=self._timeout, logger=logger)
+        self._on_session_start(logger)
+
+    def disconnect(self):
+        self._active = False
+
+    def _send(self, command, logger):
+        self._input += command
+        while self._new_line in self._input:
+            line, self._input = self._input.split(self._new_line, 1)
+            line = line.strip()
+            output = "\n{}\n\n".format(self._chassis_state.execute(line)) if line else ""
+            self._output += "{}\r\n{}{}".format(line, output, self._prompt)
+            self._output_time = time.time() + self._latency
+
+    def _receive(self, timeout, logger):
+        timeout = timeout if timeout else self._timeout
+        delay = self._output_time - time.time()
+        if self._output and delay <= timeout:
+            if delay > 0:
+                time.sleep(delay)
+            output, self._output = self._output, ""
+            return output
+
+        time.sleep(timeout)
+        raise SessionReadTimeout()
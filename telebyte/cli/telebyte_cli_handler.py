@@ -6,8 +6,9 @@ from telebyte.cli.telebyte_command_modes import DefaultCommandMode
 
 
 class TelebyteCliHandler(L1CliHandler):
-    def __init__(self, logger):
-        super(TelebyteCliHandler, self).__init__(logger)
+    def __init__(self, logger, runtime_config=None, latency_tracker=None, rate_limiter=None, transport_cache=None):
+        super(TelebyteCliHandler, self).__init__(logger, runtime_config, latency_tracker, rate_limiter,
+                                                 transport_cache)
         self.modes = CommandModeHelper.create_command_mode()
 
     @property
@@ -17,7 +18,7 @@ class TelebyteCliHandler(L1CliHandler):
     def default_mode_service(self):
         """ Default mode session
         :return:
-        :rtype: cloudshell.cli.cli_service.CliService
+        :rtype: telebyte.cli.telebyte_cli_service.TelebyteCliService
         """
 
         return self.get_cli_service(self._default_mode)
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+
+from telebyte.helpers.tracing import span
+
+
+class TelebyteCliService(object):
+    """ CLI service wrapper applying rate limits, adaptive timeouts and collecting command latency per chassis """
+
+    def __init__(self, cli_service, host, latency_tracker, rate_limiter, logger):
+        """
+        :param cli_service: cli service taken from the session pool
+        :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
+        :param host: chassis address
+        :type latency_tracker: telebyte.helpers.latency_tracker.LatencyTracker
+        :type rate_limiter: telebyte.helpers.rate_limiter.RateLimiter
+        :type logger: logging.Logger
+        """
+
+        self._cli_service = cli_service
+        self._host = host
+        self._latency_tracker = latency_tracker
+        self._rate_limiter = rate_limiter
+        self._logger = logger
+
+    def __getattr__(self, name):
+        return getattr(self._cli_service, name)
+
+    @property
+    def host(self):
+        return self._host
+
+    def send_command(self, command, action_map=None, error_map=None, command_template=None, **kwargs):
+        """ Send command with timeout derived from the latency of the same command template
+        :param command: command
+        :param command_template: template string the command is built from, the command itself by default
+        :return: command output
+        :rtype: str
+        """
+
+        command_template = command_template or command
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._latency_tracker.get_timeout(self._host, command_template)
+            self._logger.debug("Command '{}' timeout {:.2f}s".format(command, kwargs["timeout"]))
+
+        self._rate_limiter.acquire_command(self._host)
+        start_time = time.time()
+        try:
+            with span("cli", command):
+                return self._cli_service.send_command(command, action_map=action_map, error_map=error_map, **kwargs)
+        finally:
+            self._latency_tracker.record(self._host, command_template, time.time() - start_time)
+
+    def send_commands(self, commands, command_template=None, **kwargs):
+        """ Send several commands at once and read the answers of all of them, one round trip for the batch
+        :param commands: commands, the device answers each one with a prompt
+        :type commands: list[str]
+        :param command_template: template string the commands are built from, latency is tracked for the batch
+        :return: output of all the commands
+        :rtype: str
+        """
+
+        # send_command takes the rate limit token of the first command
+        for _ in commands[1:]:
+            self._rate_limiter.acquire_command(self._host)
+
+        expected_string = "(?:{}){{{}}}".format(self._cli_service.command_mode.prompt, len(commands))
+        new_line = getattr(self._cli_service.session, "_new_line", "\r")
+        return self.send_command(new_line.join(commands), expected_string=expected_string,
+                                 command_template=command_template, **kwargs)
@@ -6,7 +6,9 @@ import re
 import telebyte.command_templates.autoload as command_template
 
 from telebyte.exceptions.telebyte_exceptions import InvalidSlotNumberException
-from cloudshell.cli.command_template.command_template_executor import CommandTemplateExecutor
+from telebyte.cli.command_template_executor import TelebyteCommandTemplateExecutor
+from telebyte.helpers.query_memo import memoized
+from telebyte.helpers.tracing import traced
 
 
 class AutoloadActions(object):
@@ -14,17 +16,22 @@ class AutoloadActions(object):
     Autoload actions
     """
 
-    def __init__(self, cli_service, logger):
+    def __init__(self, cli_service, logger, query_memo=None):
         """
         :param cli_service: default mode cli_service
         :type cli_service: CliService
         :param logger:
         :type logger: Logger
+        :param query_memo: short-lived results of the queries, every query is sent to the device if not set
+        :type query_memo: telebyte.helpers.query_memo.QueryMemo
         :return:
         """
         self._cli_service = cli_service
         self._logger = logger
+        self._query_memo = query_memo
 
+    @traced
+    @memoized
     def get_device_software(self):
         """ Determain device software
 
@@ -33,7 +40,7 @@ class AutoloadActions(object):
         "software" Mux-2.6.0.1
         """
 
-        output = CommandTemplateExecutor(self._cli_service, command_template.SYSTEM_SOFTWARE).execute_command()
+        output = TelebyteCommandTemplateExecutor(self._cli_service, command_template.SYSTEM_SOFTWARE).execute_command()
 
         if "ACCEPTED" in output.upper():
             match = re.search(r"\"software\"\s*(?P<soft>.*)", output, re.IGNORECASE | re.MULTILINE)
@@ -42,6 +49,8 @@ class AutoloadActions(object):
 
         return ""
 
+    @traced
+    @memoized
     def get_device_info(self):
         """ Determain device information like Serial Number, OS Version etc
 
@@ -60,7 +69,7 @@ class AutoloadActions(object):
 
         model, serial = "", ""
 
-        output = CommandTemplateExecutor(self._cli_service, command_template.SYSTEM_INFO).execute_command()
+        output = TelebyteCommandTemplateExecutor(self._cli_service, command_template.SYSTEM_INFO).execute_command()
 
         if "ACCEPTED" in output.upper():
             match_model = re.search(r"System P/N:\s*(?P<model>.*)", output, re.IGNORECASE | re.MULTILINE)
@@ -74,6 +83,8 @@ class AutoloadActions(object):
         return model, serial
 
 
+    @traced
+    @memoized
     def get_slot_info(self, slot_id):
         """ Determine blade information Serial Number, Model Name etc
 
@@ -86,7 +97,8 @@ class AutoloadActions(object):
 
         """
 
-        output = CommandTemplateExecutor(self._cli_service, command_template.SLOT_INFO).execute_command(slot_id=slot_id)
+        executor = TelebyteCommandTemplateExecutor(self._cli_service, command_template.SLOT_INFO)
+        output = executor.execute_command(slot_id=slot_id)
 
         if "ACCEPTED" in output.upper():
             match = re.search(r"PN:\s*(?P<model>.*).*?Rev:\s*(?P<rev>.*).*?SN:\s*(?P<serial>.*)",
@@ -123,6 +135,8 @@ class AutoloadActions(object):
 
         return None, None
 
+    @traced
+    @memoized
     def get_slot_connections(self, slot_id):
         """ Determine port connections for the provided slot ID
 
@@ -136,7 +150,8 @@ class AutoloadActions(object):
 
         """
 
-        output = CommandTemplateExecutor(self._cli_service, command_template.GET_CONN).execute_command(slot_id=slot_id)
+        executor = TelebyteCommandTemplateExecutor(self._cli_service, command_template.GET_CONN)
+        output = executor.execute_command(slot_id=slot_id)
 
         if "ACCEPTED" in output.upper():
             match = re.finditer(r"(?P<out_port>\w+):(?P<in_port>\d+);", output, re.IGNORECASE | re.MULTILINE)
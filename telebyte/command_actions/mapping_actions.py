@@ -1,50 +1,96 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import re
+
 import telebyte.command_templates.mapping as command_template
-from cloudshell.cli.command_template.command_template_executor import CommandTemplateExecutor
+from telebyte.cli.command_template_executor import TelebyteCommandTemplateExecutor
+from telebyte.helpers.tracing import traced
 
 
 class MappingActions(object):
-    def __init__(self, cli_service, logger):
+    ANSWER = re.compile(r"^\s*(ACCEPTED|ERROR)\b.*$", re.MULTILINE)
+    NO_ANSWER = "ERROR  No answer"
+
+    def __init__(self, cli_service, logger, query_memo=None):
         """ Mapping actions
         :param cli_service: default mode cli_service
         :type cli_service: CliService
         :param logger:
         :type logger: Logger
+        :param query_memo: query results to invalidate on slot changes
+        :type query_memo: telebyte.helpers.query_memo.QueryMemo
         :return:
         """
         self._cli_service = cli_service
         self._logger = logger
-
-    def map_bidi(self, slot_id, src_port, dst_port):
-        """ Unidirectional mapping
-        :param src_port:
-        :param dst_ports:
+        self._query_memo = query_memo
+
+    def _invalidate(self, slot_id):
+        if self._query_memo is not None:
+            self._query_memo.invalidate(self._cli_service.host, slot_id)
+
+    @traced
+    def map_bidi(self, slot_id, out_port, in_port):
+        """ Bidirectional mapping
+        :param slot_id: slot number
+        :param out_port: output port letter, "B"
+        :param in_port: input port number, 1
         :return:
         """
 
-        try:
-            connection = "{}:{}".format(dst_port, int(src_port))
-        except:
-            connection = "{}:{}".format(src_port, int(dst_port))
+        connection = "{}:{}".format(out_port, in_port)
 
-        executor = CommandTemplateExecutor(self._cli_service, command_template.SET_CONN)
-        output = executor.execute_command(slot_id=slot_id, connection=connection)
+        executor = TelebyteCommandTemplateExecutor(self._cli_service, command_template.SET_CONN)
+        try:
+            output = executor.execute_command(slot_id=slot_id, connection=connection)
+        finally:
+            self._invalidate(slot_id)
         return output
 
+    @traced
     def map_clear(self, slot_id, port):
         """ Clear bidirectional mapping
-        :param ports:
+        :param slot_id: slot number
+        :param port: output port letter, "B"
         :return:
         """
 
-        # connection = " ".join(ports)
-
-        executor = CommandTemplateExecutor(self._cli_service, command_template.DEL_CONN)
-        output = executor.execute_command(slot_id=slot_id, connection=port)
+        executor = TelebyteCommandTemplateExecutor(self._cli_service, command_template.DEL_CONN)
+        try:
+            output = executor.execute_command(slot_id=slot_id, connection=port)
+        finally:
+            self._invalidate(slot_id)
         return output
 
+    @traced
+    def map_batch(self, slot_id, changes):
+        """ Send connection changes of the slot at once, the device answers each change with its own line
+        :param slot_id: slot number
+        :param changes: output port and input port pairs, input port 0 to clear the output, [("B", 1), ("C", 0)]
+        :return: ACCEPTED or ERROR line of each change, in the changes order
+        :rtype: list[str]
+        """
+
+        commands = []
+        for out_port, in_port in changes:
+            if in_port:
+                commands.append(command_template.SET_CONN.prepare_command(
+                    slot_id=slot_id, connection="{}:{}".format(out_port, in_port)))
+            else:
+                commands.append(command_template.DEL_CONN.prepare_command(slot_id=slot_id, connection=out_port))
+        if not commands:
+            return []
+
+        try:
+            output = self._cli_service.send_commands(commands, command_template="set con/term {slot_id} batch")
+        finally:
+            self._invalidate(slot_id)
+
+        answers = [match.group(0).strip() for match in self.ANSWER.finditer(output)][:len(commands)]
+        return answers + [self.NO_ANSWER] * (len(commands) - len(answers))
+
+
 
 
 """
@@ -97,4 +143,4 @@ ACCEPTED  set term 1 b
 
 
 
-"""
\ No newline at end of file
+"""
@@ -1,6 +1,7 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+from threading import Thread
 
 from cloudshell.layer_one.core.driver_commands_interface import DriverCommandsInterface
 from cloudshell.layer_one.core.response.response_info import ResourceDescriptionResponseInfo, GetStateIdResponseInfo, \
@@ -11,14 +12,27 @@ from cloudshell.layer_one.core.response.resource_info.entities.port import Port
 
 from telebyte.command_actions.autoload_actions import AutoloadActions
 from telebyte.command_actions.mapping_actions import MappingActions
+from telebyte.cli.racing_session_manager import TransportCache
 from telebyte.cli.telebyte_cli_handler import TelebyteCliHandler
-from telebyte.exceptions.telebyte_exceptions import InvalidSlotNumberException, InvalidConnectionException
+from telebyte.exceptions.telebyte_exceptions import InvalidSlotNumberException, InvalidConnectionException, \
+    OpticsUnavailableException
+from telebyte.helpers.connection_snapshot import ConnectionSnapshot
+from telebyte.helpers.latency_tracker import LatencyTracker
+from telebyte.helpers.mapping_journal import MappingJournal
+from telebyte.helpers.optical_sampler import OpticalSampler
+from telebyte.helpers.port_index import PortIndex
+from telebyte.helpers.profiler import CommandProfiler
+from telebyte.helpers.query_memo import QueryMemo
+from telebyte.helpers.rate_limiter import RateLimiter
+from telebyte.helpers.slot_locks import SlotLockManager
+from telebyte.helpers.tracing import wrap_commands
 
 
 class DriverCommands(DriverCommandsInterface):
     """ Driver commands implementation """
-    PORT_ADD = 64
     SLOT_COUNT = 6
+    RESTORE_BATCH = 16
+    OPTICAL_ATTRIBUTES = {"Rx Power (dBm)": "rx_power", "Tx Power (dBm)": "tx_power", "Wavelength": "wavelength"}
 
     def __init__(self, logger, runtime_config):
         """
@@ -28,8 +42,94 @@ class DriverCommands(DriverCommandsInterface):
 
         self._logger = logger
         self._runtime_config = runtime_config
-        self._cli_handler = TelebyteCliHandler(logger)
+        self._latency_tracker = LatencyTracker(runtime_config)
+        self._rate_limiter = RateLimiter(runtime_config)
+        self._transport_cache = TransportCache()
+        self._cli_handler = TelebyteCliHandler(logger, runtime_config, self._latency_tracker, self._rate_limiter,
+                                               self._transport_cache)
         self._max_slot_count = runtime_config.read_key("DRIVER.SLOT_COUNT", self.SLOT_COUNT)
+        self._restore_batch = max(1, int(runtime_config.read_key("DRIVER.RESTORE_BATCH", self.RESTORE_BATCH)))
+        self._port_index = PortIndex()
+        self._slot_locks = SlotLockManager()
+        self._optical_sampler = OpticalSampler(logger, runtime_config)
+        self._journal = MappingJournal(logger, runtime_config)
+        self._query_memo = QueryMemo(runtime_config)
+        wrap_commands(self, DriverCommandsInterface.__abstractmethods__)
+        self._profiler = CommandProfiler(logger, runtime_config)
+        self._profiler.wrap_commands(self, DriverCommandsInterface.__abstractmethods__)
+
+    def _get_slots(self, autoload_actions):
+        """ Iterate over installed slots
+        :type autoload_actions: AutoloadActions
+        :return: slot ID, slot info, out ports count, in ports count
+        """
+
+        slot_id = 0
+        while slot_id <= self._max_slot_count:
+            slot_id += 1
+            try:
+                slot_info = autoload_actions.get_slot_info(slot_id=slot_id)
+            except InvalidSlotNumberException:
+                break
+
+            self._logger.debug("SLOT INFO: {}".format(slot_info))
+            if not slot_info:
+                continue
+
+            out_ports, in_ports = autoload_actions.get_in_out_ports(slot_info=slot_info)
+            self._logger.debug("OUT PORTS: {}, IN PORTS: {}".format(out_ports, in_ports))
+            if out_ports is None:
+                raise Exception("Can not determine out port count")
+
+            yield slot_id, slot_info, out_ports, in_ports
+
+    def _build_port_index(self, session, address):
+        """ Index chassis ports if autoload was not executed since driver start """
+
+        if self._port_index.is_indexed(address):
+            return
+
+        self._logger.info("Building port index for {}".format(address))
+        autoload_actions = AutoloadActions(session, self._logger, self._query_memo)
+        for slot_id, _, out_ports, in_ports in self._get_slots(autoload_actions):
+            self._port_index.add_slot(address, slot_id, out_ports, in_ports)
+        self._port_index.mark_indexed(address)
+
+    def _resolve_ports(self, session, port_addresses):
+        """ Validate and normalize port addresses against the port index
+        :type port_addresses: list[str]
+        :rtype: list[telebyte.helpers.port_index.PortRecord]
+        """
+
+        for address in {PortIndex.split_address(port_address)[0] for port_address in port_addresses}:
+            self._build_port_index(session, address)
+
+        return [self._port_index.resolve(port_address) for port_address in port_addresses]
+
+    def _lock_slots(self, port_addresses):
+        """ Lock slots of the ports, should be taken before the session to keep the same order everywhere """
+
+        return self._slot_locks.lock(PortIndex.split_address(port_address)[:2] for port_address in port_addresses)
+
+    def _journal_mapping(self, address, slot_id, out_port, in_port, output):
+        """ Record the connection change in the mapping journal if the device accepted it
+        :param address: chassis address, "192.168.42.240"
+        :param output: mapping command output
+        """
+
+        if "ACCEPTED" in output.upper():
+            self._journal.record(address, slot_id, out_port, in_port)
+
+    @staticmethod
+    def _get_connection_ports(src, dst):
+        """ Validate ports pair and return it as output and input port records """
+
+        if src.slot_id != dst.slot_id:
+            raise InvalidConnectionException("Connections can be created inside one blade only")
+        if src.is_output == dst.is_output:
+            raise InvalidConnectionException("Connection should be created between output and input ports")
+
+        return (src, dst) if src.is_output else (dst, src)
 
     def login(self, address, username, password):
         """
@@ -52,9 +152,21 @@ class DriverCommands(DriverCommandsInterface):
 
         self._cli_handler.define_session_attributes(address, username, password)
         with self._cli_handler.default_mode_service() as session:
-            actions = AutoloadActions(session, self._logger)
+            actions = AutoloadActions(session, self._logger, self._query_memo)
             self._logger.info("Model: {}, Serial: {}".format(*actions.get_device_info()))
 
+            if self._journal.enabled:
+                # journal is loaded once per chassis, recovered connections are available without a device scan
+                self._logger.info("Mapping journal sequence {}, recovered connections of {} slots".format(
+                    self._journal.last_sequence(address), len(self._journal.get_connections(address))))
+
+            if self._optical_sampler.enabled and not self._optical_sampler.is_running(address):
+                self._build_port_index(session, address)
+                sampler_cli_handler = TelebyteCliHandler(self._logger, self._runtime_config, self._latency_tracker,
+                                                         self._rate_limiter, self._transport_cache)
+                sampler_cli_handler.define_session_attributes(address, username, password)
+                self._optical_sampler.start(address, sampler_cli_handler, self._port_index.get_slot_ids(address))
+
     def get_resource_description(self, address):
         """ Auto-load function to retrieve all information from the device
         :param address: resource address, "192.168.42.240"
@@ -89,7 +201,7 @@ class DriverCommands(DriverCommandsInterface):
         """
 
         with self._cli_handler.default_mode_service() as session:
-            autoload_actions = AutoloadActions(session, self._logger)
+            autoload_actions = AutoloadActions(session, self._logger, self._query_memo)
 
             dev_model, serial_number = autoload_actions.get_device_info()
 
@@ -98,61 +210,51 @@ class DriverCommands(DriverCommandsInterface):
             chassis.set_os_version(autoload_actions.get_device_software())
             chassis.set_serial_number(serial_number)
 
-            slot_id = 0
-            while slot_id <= self._max_slot_count:
+            slot_ids = []
+            for slot_id, slot_info, out_ports, in_ports in self._get_slots(autoload_actions):
+                slot_ids.append(slot_id)
+                blade = Blade(slot_id, "Generic L1 Module", slot_info.get("Serial", ""))
+                blade.set_model_name(slot_info.get("Model", ""))
+                blade.set_parent_resource(chassis)
+
+                ports = {}
+                for record in self._port_index.add_slot(address, slot_id, out_ports, in_ports):
+                    port_serial = "{dev_serial}.{port_id}".format(dev_serial=slot_info.get("Serial", ""),
+                                                                  port_id=record.port_id)
+                    self._logger.debug("Port ID : {}".format(record.port_id))
+
+                    port = Port(record.port_id, "Generic L1 Port", port_serial)
+                    port.set_parent_resource(blade)
+                    ports[record] = port
+
+                # autoload doesn't lock slots, a mapping done while the slot is read makes the read outdated
+                journal_sequence = self._journal.slot_sequence(address, slot_id)
                 try:
-                    slot_id += 1
-                    slot_info = autoload_actions.get_slot_info(slot_id=slot_id)
-                    self._logger.debug("SLOT INFO: {}".format(slot_info))
-
-                    if slot_info:
-                        blade = Blade(slot_id, "Generic L1 Module", slot_info.get("Serial", ""))
-                        blade.set_model_name(slot_info.get("Model", ""))
-                        blade.set_parent_resource(chassis)
-
-                        ports = {}
-                        out_ports, in_ports = autoload_actions.get_in_out_ports(slot_info=slot_info)
-                        self._logger.debug("OUT PORTS: {}, IN PORTS: {}".format(out_ports, in_ports))
-                        if out_ports is None:
-                            raise Exception("Can not determine out port count")
-
-                        for i in range(1, out_ports + 1):
-                            port_id = chr(i + self.PORT_ADD)
-                            port_serial = "{dev_serial}.{port_id}".format(dev_serial=slot_info.get("Serial", ""),
-                                                                          port_id=port_id)
-                            self._logger.debug("Port ID : {}".format(port_id))
-
-                            port = Port(port_id, "Generic L1 Port", port_serial)
-                            port.set_parent_resource(blade)
-                            ports[port_id] = port
-
-                        for i in range(1, in_ports + 1):
-                            port_id = i
-
-                            port_serial = "{dev_serial}.{port_id}".format(dev_serial=slot_info.get("Serial", ""),
-                                                                          port_id=port_id)
-                            self._logger.debug("Port ID : {}".format(port_id))
-
-                            port = Port(port_id, "Generic L1 Port", port_serial)
-                            port.set_parent_resource(blade)
-                            ports[port_id] = port
-
-                        conn_info = autoload_actions.get_slot_connections(slot_id=slot_id)
-                        self._logger.debug("SLOT CONNECTIONS: {}".format(conn_info))
-
-                        for out_port_id, in_port_id in conn_info.items():
-                            if in_port_id == 0: #  means no connection
-                                continue
-
-                            out_port = ports.get(out_port_id)
-                            in_port = ports.get(in_port_id)
-                            out_port.add_mapping(in_port)
-                            in_port.add_mapping(out_port)
-
-
+                    conn_info = autoload_actions.get_slot_connections(slot_id=slot_id)
                 except InvalidSlotNumberException:
-                    # self._max_slot_count = min(slot_id, self._max_slot_count)
                     break
+                self._logger.debug("SLOT CONNECTIONS: {}".format(conn_info))
+                drift = self._journal.sync_slot(address, slot_id, conn_info, journal_sequence)
+                if drift and journal_sequence:
+                    self._logger.warning("Slot {} connections differ from the mapping journal, device has: {}".format(
+                        slot_id, ", ".join("{}:{}".format(out_port, in_port) for _, out_port, in_port in drift)))
+
+                for out_port_id, in_port_id in conn_info.items():
+                    if in_port_id == 0:  # means no connection
+                        continue
+
+                    out_port = ports.get(self._port_index.get(address, slot_id, out_port_id))
+                    in_port = ports.get(self._port_index.get(address, slot_id, in_port_id))
+                    if out_port is None or in_port is None:
+                        self._logger.warning("Skipping unknown connection {}:{} on slot {}".format(
+                            out_port_id, in_port_id, slot_id))
+                        continue
+                    out_port.add_mapping(in_port)
+                    in_port.add_mapping(out_port)
+
+            # index is updated in place, concurrent mappings never see the chassis half indexed
+            self._port_index.retain_slots(address, slot_ids)
+            self._port_index.mark_indexed(address)
 
         return ResourceDescriptionResponseInfo([chassis])
 
@@ -179,16 +281,15 @@ class DriverCommands(DriverCommandsInterface):
         :raises Exception: if command failed
         """
 
-        with self._cli_handler.default_mode_service() as session:
-            mapping_actions = MappingActions(session, self._logger)
-
-            _, src_blade, src = src_port.split("/")
-            _, dst_blade, dst = dst_port.split("/")
-
-            if src_blade != dst_blade:
-                raise InvalidConnectionException("Connections can be created inside one blade only")
+        with self._lock_slots([src_port, dst_port]), self._cli_handler.default_mode_service() as session:
+            src, dst = self._resolve_ports(session, [src_port, dst_port])
+            out_port, in_port = self._get_connection_ports(src, dst)
 
-            mapping_actions.map_bidi(slot_id=src_blade, src_port=src, dst_port=dst)
+            address = PortIndex.split_address(src_port)[0]
+            mapping_actions = MappingActions(session, self._logger, self._query_memo)
+            output = mapping_actions.map_bidi(slot_id=out_port.slot_id, out_port=out_port.out_port,
+                                              in_port=in_port.in_port)
+            self._journal_mapping(address, out_port.slot_id, out_port.out_port, in_port.in_port, output)
 
     def map_clear_to(self, src_port, dst_ports):
         """ Remove simplex/multi-cast/duplex connection ending on the destination port
@@ -203,17 +304,22 @@ class DriverCommands(DriverCommandsInterface):
 
         self._logger.debug("SRC: {}, DST: {}".format(src_port, dst_ports))
 
-        _, blade_id, src = src_port.split("/")
+        port_addresses = [src_port] + list(dst_ports)
+        with self._lock_slots(port_addresses), self._cli_handler.default_mode_service() as session:
+            records = self._resolve_ports(session, port_addresses)
+            src = records[0]
 
-        try:
-            src = int(src)
-            self._logger.debug("Port identifier should be literal not numeric. Got: {}".format(src_port))
-        except ValueError:
-            with self._cli_handler.default_mode_service() as session:
-                mapping_actions = MappingActions(session, self._logger)
-                mapping_actions.map_clear(slot_id=blade_id, port=src)
+            out_ports = []
+            for dst in records[1:]:
+                out_port, _ = self._get_connection_ports(src, dst)
+                if out_port not in out_ports:
+                    out_ports.append(out_port)
 
-        # raise Exception("Unidirectional connection does not supported")
+            address = PortIndex.split_address(src_port)[0]
+            mapping_actions = MappingActions(session, self._logger, self._query_memo)
+            for out_port in out_ports:
+                output = mapping_actions.map_clear(slot_id=out_port.slot_id, port=out_port.out_port)
+                self._journal_mapping(address, out_port.slot_id, out_port.out_port, 0, output)
 
     def map_clear(self, ports):
         """
@@ -235,14 +341,29 @@ class DriverCommands(DriverCommandsInterface):
                     raise Exception("self.__class__.__name__", ",".join(exceptions))
         """
 
-        with self._cli_handler.default_mode_service() as session:
-            mapping_actions = MappingActions(session, self._logger)
-            for port in ports:
-
-                _, blade_id, src = port.split("/")
-
-                mapping_actions.map_clear(slot_id=blade_id, port=src)
-
+        with self._lock_slots(ports), self._cli_handler.default_mode_service() as session:
+            records = self._resolve_ports(session, ports)
+
+            out_ports = [(record.slot_id, record.out_port) for record in records if record.is_output]
+            in_ports = [record for record in records if not record.is_output]
+            if in_ports:
+                # input port may feed several outputs, take them from the slot connections table
+                autoload_actions = AutoloadActions(session, self._logger)
+                for slot_id in sorted({record.slot_id for record in in_ports}):
+                    in_port_ids = {record.in_port for record in in_ports if record.slot_id == slot_id}
+                    connections = autoload_actions.get_slot_connections(slot_id=slot_id)
+                    out_ports.extend((slot_id, PortIndex.normalize_port(out_port_id))
+                                     for out_port_id, in_port_id in sorted(connections.items())
+                                     if in_port_id in in_port_ids)
+
+            address = PortIndex.split_address(ports[0])[0]
+            mapping_actions = MappingActions(session, self._logger, self._query_memo)
+            cleared = set()
+            for slot_id, out_port in out_ports:
+                if (slot_id, out_port) not in cleared:
+                    cleared.add((slot_id, out_port))
+                    output = mapping_actions.map_clear(slot_id=slot_id, port=out_port)
+                    self._journal_mapping(address, slot_id, out_port, 0, output)
 
     def map_tap(self, src_port, dst_ports):
         """
@@ -287,7 +408,26 @@ class DriverCommands(DriverCommandsInterface):
                 value = session.send_command(command)
                 return AttributeValueResponseInfo(value)
         """
-        raise NotImplementedError
+
+        field = self.OPTICAL_ATTRIBUTES.get(attribute_name)
+        # optical readings are served only with the sampler enabled, the chassis is not queried otherwise
+        if field is None or not self._optical_sampler.enabled:
+            raise NotImplementedError
+
+        address = PortIndex.split_address(cs_address)[0]
+        sample = None
+        with self._cli_handler.default_mode_service() as session:
+            record = self._resolve_ports(session, [cs_address])[0]
+            if self._optical_sampler.is_running(address):
+                sample = self._optical_sampler.latest(address, record.slot_id, record.port_id)
+            if sample is None:
+                optics = self._optical_sampler.read_slot(session, record.slot_id)
+                self._optical_sampler.add_samples(address, record.slot_id, optics)
+                sample = self._optical_sampler.latest(address, record.slot_id, record.port_id)
+
+        if sample is None:
+            raise OpticsUnavailableException("{} is not available for {}".format(attribute_name, cs_address))
+        return AttributeValueResponseInfo(str(sample[field]))
 
     def set_attribute_value(self, cs_address, attribute_name, attribute_value):
         """
@@ -345,3 +485,112 @@ class DriverCommands(DriverCommandsInterface):
 
         self._logger.info("set_state_id {}".format(state_id))
         # raise NotImplementedError
+
+    def export_connections(self, address):
+        """ Read connection tables of all chassis slots, login should be called first
+        :param address: chassis address, "192.168.42.240"
+        :rtype: telebyte.helpers.connection_snapshot.ConnectionSnapshot
+        """
+
+        with self._cli_handler.default_mode_service() as session:
+            self._build_port_index(session, address)
+
+        slot_ids = self._port_index.get_slot_ids(address)
+        snapshot = ConnectionSnapshot(address)
+        with self._slot_locks.lock((address, slot_id) for slot_id in slot_ids), \
+                self._cli_handler.default_mode_service() as session:
+            autoload_actions = AutoloadActions(session, self._logger)
+            for slot_id in slot_ids:
+                snapshot.set_slot(slot_id, autoload_actions.get_slot_connections(slot_id=slot_id))
+
+        return snapshot
+
+    def journal_connections(self, address):
+        """ Connections recovered from the mapping journal, the device is not read
+
+        Used to bring back the last connections the driver knew, e.g. after the chassis lost its configuration
+        :param address: chassis address, "192.168.42.240"
+        :rtype: telebyte.helpers.connection_snapshot.ConnectionSnapshot
+        :raises Exception: if journal is disabled
+        """
+
+        if not self._journal.enabled:
+            raise Exception("Mapping journal is disabled, set JOURNAL.ENABLED to TRUE")
+        return ConnectionSnapshot(address, self._journal.get_connections(address))
+
+    def connection_changes(self, address, since_sequence=0):
+        """ Connection changes recorded in the mapping journal after the sequence
+        :param address: chassis address, "192.168.42.240"
+        :param since_sequence: sequence of the last change already seen, 0 for all changes
+        :return: journal records ordered by sequence, the last one has the sequence to pass next time
+        :rtype: list[telebyte.helpers.mapping_journal.JournalRecord]
+        """
+
+        return self._journal.changes_since(address, since_sequence)
+
+    def restore_connections(self, snapshot):
+        """ Apply connection snapshot, only the connections different from the snapshot ones are changed
+
+        Connection changes of a slot are sent in batches of DRIVER.RESTORE_BATCH commands, one round trip per batch.
+        Slots are restored in parallel on their own CLI sessions when CLI.SESSIONS is over 1, one by one otherwise
+        :type snapshot: telebyte.helpers.connection_snapshot.ConnectionSnapshot
+        :return: count of connections changed by the device per slot, skipped and failed changes are not counted
+        :rtype: dict
+        :raises InvalidConnectionException: if some connections failed, the others are applied anyway
+        """
+
+        address = snapshot.address
+        with self._cli_handler.default_mode_service() as session:
+            self._build_port_index(session, address)
+
+        changed, errors = {}, []
+        missing_slots = [slot_id for slot_id in snapshot.slots if slot_id not in self._port_index.get_slot_ids(address)]
+        errors.extend("Slot {} is not found on {}".format(slot_id, address) for slot_id in missing_slots)
+
+        threads = []
+        for slot_id, connections in snapshot.slots.items():
+            if slot_id not in missing_slots:
+                thread = Thread(target=self._restore_slot, args=(address, slot_id, connections, changed, errors),
+                                name="restore-{}-{}".format(address, slot_id))
+                thread.daemon = True
+                thread.start()
+                threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise InvalidConnectionException("Failed to restore connections, {} changed: {}".format(
+                sum(changed.values()), "; ".join(errors)))
+        return changed
+
+    def _restore_slot(self, address, slot_id, connections, changed, errors):
+        """ Apply slot connections, results and errors are added to the shared changed dict and errors list """
+
+        try:
+            with self._slot_locks.lock([(address, slot_id)]), self._cli_handler.default_mode_service() as session:
+                current_connections = AutoloadActions(session, self._logger).get_slot_connections(slot_id=slot_id)
+                changes = ConnectionSnapshot.changes(connections, current_connections)
+                self._logger.debug("Slot {} connection changes: {}".format(slot_id, changes))
+
+                valid_changes = []
+                for out_port, in_port in changes:
+                    if self._port_index.get(address, slot_id, out_port) is None or (
+                            in_port and self._port_index.get(address, slot_id, in_port) is None):
+                        errors.append("Slot {} connection {}:{} is not valid".format(slot_id, out_port, in_port))
+                    else:
+                        valid_changes.append((out_port, in_port))
+
+                mapping_actions = MappingActions(session, self._logger, self._query_memo)
+                changed[slot_id] = 0
+                for batch_start in range(0, len(valid_changes), self._restore_batch):
+                    batch = valid_changes[batch_start:batch_start + self._restore_batch]
+                    outputs = mapping_actions.map_batch(slot_id=slot_id, changes=batch)
+                    for (out_port, in_port), output in zip(batch, outputs):
+                        if "ACCEPTED" in output.upper():
+                            changed[slot_id] += 1
+                        else:
+                            errors.append("Slot {} connection {}:{} {}".format(slot_id, out_port, in_port, output))
+                        self._journal_mapping(address, slot_id, out_port, in_port, output)
+        except Exception as e:
+            self._logger.exception("Failed to restore slot {} connections".format(slot_id))
+            errors.append("Slot {} {}".format(slot_id, e))
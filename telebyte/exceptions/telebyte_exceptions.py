@@ -5,4 +5,13 @@ class InvalidSlotNumberException(Exception):
     pass
 
 class InvalidConnectionException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidPortException(Exception):
+    pass
+
+class RateLimitException(Exception):
+    pass
+
+class OpticsUnavailableException(Exception):
+    pass
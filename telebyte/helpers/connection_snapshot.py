@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from collections import OrderedDict
+
+from telebyte.helpers.port_index import PortIndex
+
+
+class ConnectionSnapshot(object):
+    """ Cross-connect configuration of a chassis
+
+    Saved as text, a header line and one line per slot with connected output ports only:
+        # telebyte connections 192.168.42.240 2026-10-18 22:53:38
+        1 A:1;C:1;D:2;
+        3
+    Output ports missing from a slot line are not connected
+    """
+
+    HEADER = "# telebyte connections"
+    SLOT_LINE = re.compile(r"^(?P<slot_id>\d+)\s*(?P<connections>.*)$")
+    CONNECTION = re.compile(r"(?P<out_port>[A-Za-z]+):(?P<in_port>\d+);")
+
+    def __init__(self, address, slots=None, created=None):
+        """
+        :param address: chassis address, "192.168.42.240"
+        :param slots: {slot ID: {output port: input port}}
+        :param created: snapshot time, current time by default
+        """
+
+        self.address = address
+        self.slots = OrderedDict()
+        self.created = created or time.time()
+        for slot_id, connections in sorted((slots or {}).items()):
+            self.set_slot(slot_id, connections)
+
+    def set_slot(self, slot_id, connections):
+        """ Set slot connections, input port 0 means the output is not connected
+        :param connections: {output port: input port}, {"A": 1, "B": 0}
+        """
+
+        self.slots[int(slot_id)] = OrderedDict(sorted(
+            ((PortIndex.normalize_port(out_port), int(in_port)) for out_port, in_port in connections.items()
+             if int(in_port)), key=lambda item: PortIndex.out_port_number(item[0])))
+
+    @staticmethod
+    def changes(connections, current_connections):
+        """ Commands needed to turn the current slot connections into the snapshot ones
+        :param connections: snapshot slot connections, {"A": 1}
+        :param current_connections: connections read from the device, {"A": 1, "B": 2, "C": 0}
+        :return: output port and input port pairs ordered by output port, input port 0 to terminate the output
+        :rtype: list[tuple]
+        """
+
+        current_connections = {PortIndex.normalize_port(out_port): int(in_port)
+                               for out_port, in_port in current_connections.items()}
+        changes = [(out_port, 0) for out_port, in_port in current_connections.items()
+                   if in_port and out_port not in connections]
+        changes.extend((out_port, in_port) for out_port, in_port in connections.items()
+                       if current_connections.get(out_port) != in_port)
+        return sorted(changes, key=lambda change: PortIndex.out_port_number(change[0]))
+
+    def dumps(self):
+        lines = ["{} {} {}".format(self.HEADER, self.address,
+                                   time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.created)))]
+        for slot_id, connections in self.slots.items():
+            lines.append("{} {}".format(slot_id, "".join(
+                "{}:{};".format(out_port, in_port) for out_port, in_port in connections.items())).rstrip())
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def loads(cls, data):
+        """
+        :raises ValueError: if data is not a connection snapshot
+        """
+
+        lines = [line.strip() for line in data.splitlines() if line.strip()]
+        if not lines or not lines[0].startswith(cls.HEADER):
+            raise ValueError("Connection snapshot header is not found")
+
+        header = lines[0][len(cls.HEADER):].split(None, 1)
+        if not header:
+            raise ValueError("Connection snapshot address is not found")
+        created = None
+        if len(header) > 1:
+            created = time.mktime(time.strptime(header[1], "%Y-%m-%d %H:%M:%S"))
+
+        snapshot = cls(header[0], created=created)
+        for line in lines[1:]:
+            match = cls.SLOT_LINE.match(line)
+            if not match:
+                raise ValueError("Incorrect connection snapshot line '{}'".format(line))
+            snapshot.set_slot(match.group("slot_id"), {item.group("out_port"): item.group("in_port")
+                                                       for item in cls.CONNECTION.finditer(match.group("connections"))})
+        return snapshot
+
+    def save(self, file_path):
+        with open(file_path, "w") as snapshot_file:
+            snapshot_file.write(self.dumps())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path) as snapshot_file:
+            return cls.loads(snapshot_file.read())
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from threading import Lock
+
+
+class LatencyTracker(object):
+    """ Moving average of command latency per chassis and command template, used to derive command timeouts
+
+    Timeout is the smoothed latency plus DEVIATION_FACTOR smoothed deviations, as TCP does for retransmission
+    timeout, limited by the configured floor and ceiling. Commands without history use the chassis average,
+    chassis without history use the ceiling
+    """
+
+    MIN_TIMEOUT = 5
+    MAX_TIMEOUT = 30
+    DEVIATION_FACTOR = 4
+    SMOOTHING = 0.125
+
+    def __init__(self, runtime_config):
+        """
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        """
+
+        self.enabled = bool(runtime_config.read_key("TIMEOUTS.ADAPTIVE", True))
+        self._min_timeout = float(runtime_config.read_key("TIMEOUTS.MIN", self.MIN_TIMEOUT))
+        self._max_timeout = float(runtime_config.read_key("TIMEOUTS.MAX", self.MAX_TIMEOUT))
+        self._deviation_factor = float(runtime_config.read_key("TIMEOUTS.DEVIATION_FACTOR", self.DEVIATION_FACTOR))
+        self._smoothing = float(runtime_config.read_key("TIMEOUTS.SMOOTHING", self.SMOOTHING))
+        self._stats = {}
+        self._lock = Lock()
+
+    def _update(self, key, latency):
+        stats = self._stats.get(key)
+        if stats is None:
+            self._stats[key] = [latency, latency / 2]
+            return
+
+        average, deviation = stats
+        stats[1] = (1 - self._smoothing) * deviation + self._smoothing * abs(latency - average)
+        stats[0] = (1 - self._smoothing) * average + self._smoothing * latency
+
+    def record(self, host, command_template, latency):
+        """ Register command execution time
+        :param host: chassis address
+        :param command_template: command template string, "show con {slot_id} all"
+        :param latency: seconds
+        """
+
+        with self._lock:
+            self._update((host, command_template), latency)
+            self._update((host, None), latency)
+
+    def get_average(self, host, command_template=None):
+        """ Smoothed latency, None if there is no history """
+
+        stats = self._stats.get((host, command_template))
+        return stats[0] if stats else None
+
+    def get_timeout(self, host, command_template):
+        """ Command timeout in seconds """
+
+        if not self.enabled:
+            return self._max_timeout
+
+        with self._lock:
+            stats = self._stats.get((host, command_template)) or self._stats.get((host, None))
+            if stats is None:
+                return self._max_timeout
+            timeout = stats[0] + self._deviation_factor * stats[1]
+
+        return min(max(timeout, self._min_timeout), self._max_timeout)
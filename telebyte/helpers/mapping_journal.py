@@ -0,0 +1,342 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+from collections import namedtuple
+from threading import Condition, Lock
+
+from telebyte.helpers.port_index import PortIndex
+from telebyte.helpers.tracing import span
+
+
+class JournalRecord(namedtuple("JournalRecord", ["sequence", "timestamp", "slot_id", "out_port", "in_port",
+                                                 "operation"])):
+    """ Accepted connection change, in_port is 0 if the output port was disconnected
+
+    Operation is "con" or "term" for the changes made by the driver, "sync" for the ones found by autoload
+    """
+
+    __slots__ = ()
+
+    FORMAT = "{}\t{:.3f}\t{}\t{}\t{}\t{}\n"
+
+    def dumps(self):
+        return self.FORMAT.format(*self)
+
+    @classmethod
+    def loads(cls, line):
+        """
+        :raises ValueError: if line is not a journal record
+        """
+
+        sequence, timestamp, slot_id, out_port, in_port, operation = line.rstrip("\n").split("\t")
+        return cls(int(sequence), float(timestamp), int(slot_id), out_port, int(in_port), operation)
+
+
+class ChassisJournal(object):
+    """ Journal file of one chassis
+
+    Records are written right away and fsync is shared, a thread that needs its record on disk either
+    syncs the file or waits for the sync already in progress, which covers all records written before it started
+    """
+
+    def __init__(self, file_path, max_records, logger):
+        self._file_path = file_path
+        self._max_records = max_records
+        self._logger = logger
+        self.records = []
+        self.connections = {}
+        self.sequence = 0
+        self._slot_sequences = {}
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._lock = Lock()
+        self._sync_condition = Condition(Lock())
+        self._load()
+        self._fd = self._open()
+
+    def _open(self):
+        return os.open(self._file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0))
+
+    def _load(self):
+        if not os.path.exists(self._file_path):
+            return
+
+        with open(self._file_path, "rb") as journal_file:
+            data = journal_file.read()
+
+        # the last line may be cut by a crash in the middle of write, it is cut off the file,
+        # so the next record starts on its own line
+        complete_size = data.rfind(b"\n") + 1
+        if complete_size < len(data):
+            self._logger.warning("Removed incomplete last record of {}".format(self._file_path))
+            with open(self._file_path, "r+b") as journal_file:
+                journal_file.truncate(complete_size)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+        for line_number, line in enumerate(data[:complete_size].decode("utf-8").splitlines(), 1):
+            try:
+                record = JournalRecord.loads(line)
+            except ValueError:
+                self._logger.warning("Skipped incorrect line {} of {}".format(line_number, self._file_path))
+                continue
+            self._apply(record)
+        self._written = self._synced = self.sequence
+
+        if len(self.records) > self._max_records:
+            self._compact()
+            self._rewrite()
+
+    def _apply(self, record):
+        self.records.append(record)
+        self.sequence = max(self.sequence, record.sequence)
+        self._slot_sequences[record.slot_id] = max(self._slot_sequences.get(record.slot_id, 0), record.sequence)
+        slot_connections = self.connections.setdefault(record.slot_id, {})
+        if record.in_port:
+            slot_connections[record.out_port] = record.in_port
+        else:
+            slot_connections.pop(record.out_port, None)
+
+    def _compact(self):
+        """ Keep the latest record of each output port, replaying the records still gives the same connections """
+
+        latest = {}
+        for record in self.records:
+            latest[(record.slot_id, record.out_port)] = record
+        self.records = sorted(latest.values(), key=lambda record: record.sequence)
+
+    def _rewrite(self):
+        temp_path = self._file_path + ".tmp"
+        with open(temp_path, "w") as journal_file:
+            journal_file.write("".join(record.dumps() for record in self.records))
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        if os.name == "nt":
+            os.remove(self._file_path)
+        os.rename(temp_path, self._file_path)
+
+    def append(self, changes, operation):
+        """ Write records and wait until they are on disk
+        :param changes: slot ID, output port and input port of each change
+        :return: sequence of the last record
+        """
+
+        with self._lock:
+            sequence = self._write(changes, operation)
+
+        with span("journal_sync"):
+            self._sync(sequence)
+        return sequence
+
+    def sync_slot(self, slot_id, connections, operation, since_sequence=None):
+        """ Write records making the slot connections equal to the ones read from the device
+        :param connections: {output port: input port}, connected ports only
+        :param since_sequence: slot sequence taken before the device was read, nothing is written
+            if the slot was changed after it
+        :return: written changes, None if the slot was changed since the sequence
+        :rtype: list[tuple]
+        """
+
+        with self._lock:
+            if since_sequence is not None and self.slot_sequence(slot_id) > since_sequence:
+                return None
+
+            known = self.connections.get(slot_id, {})
+            changes = [(slot_id, out_port, 0) for out_port in known if out_port not in connections]
+            changes.extend((slot_id, out_port, in_port) for out_port, in_port in connections.items()
+                           if known.get(out_port) != in_port)
+            changes.sort(key=lambda change: PortIndex.out_port_number(change[1]))
+            sequence = self._write(changes, operation)
+
+        with span("journal_sync"):
+            self._sync(sequence)
+        return changes
+
+    def _write(self, changes, operation):
+        """ Apply and write records, should be called with the lock taken
+        :return: sequence of the last record
+        """
+
+        timestamp = time.time()
+        lines = []
+        for slot_id, out_port, in_port in changes:
+            self.sequence += 1
+            record = JournalRecord(self.sequence, timestamp, slot_id, out_port, in_port, operation)
+            self._apply(record)
+            lines.append(record.dumps())
+        if not lines:
+            return self._written
+
+        os.write(self._fd, "".join(lines).encode("utf-8"))
+        self._written = self.sequence
+        if len(self.records) > 2 * self._max_records:
+            self._compact_file()
+        return self._written
+
+    def _compact_file(self):
+        """ Compact records and replace the file with them, should be called with the lock taken """
+
+        self._compact()
+        with self._sync_condition:
+            # fsync in progress uses the current descriptor, the file is replaced after it is done
+            while self._syncing:
+                self._sync_condition.wait()
+            os.close(self._fd)
+            self._rewrite()
+            self._fd = self._open()
+            self._synced = self._written
+            self._sync_condition.notify_all()
+
+    def slot_sequence(self, slot_id):
+        """ Sequence of the last record of the slot, 0 if there is none """
+
+        return self._slot_sequences.get(slot_id, 0)
+
+    def _sync(self, sequence):
+        with self._sync_condition:
+            while self._synced < sequence:
+                if self._syncing:
+                    self._sync_condition.wait()
+                    continue
+
+                self._syncing = True
+                written, synced = self._written, False
+                self._sync_condition.release()
+                try:
+                    os.fsync(self._fd)
+                    synced = True
+                finally:
+                    self._sync_condition.acquire()
+                    self._syncing = False
+                    if synced:
+                        self._synced = max(self._synced, written)
+                    self._sync_condition.notify_all()
+
+    def changes_since(self, sequence):
+        """ Records after the sequence, compacted journal keeps only the latest record of each port
+        :rtype: list[JournalRecord]
+        """
+
+        with self._lock:
+            return [record for record in self.records if record.sequence > sequence]
+
+    def get_connections(self):
+        with self._lock:
+            return {slot_id: dict(ports) for slot_id, ports in self.connections.items() if ports}
+
+    def close(self):
+        with self._lock:
+            os.close(self._fd)
+
+
+class MappingJournal(object):
+    """ Append-only journal of accepted connection changes with per chassis sequence numbers
+
+    Records are written to <LOG_PATH>/<driver>/journal/<address>.journal, one tab separated line per record:
+        sequence, time, slot ID, output port, input port, operation
+    The journal is loaded at the first login after the driver start, the recovered connections can be restored
+    to the chassis and autoload records the differences between them and the device ones. changes_since answers
+    what changed after a sequence. Requests of one chassis are always executed by the same process, so every file
+    has one writer.
+    """
+
+    MAX_RECORDS = 10000
+    CONNECT = "con"
+    TERMINATE = "term"
+    SYNC = "sync"
+
+    def __init__(self, logger, runtime_config, driver_name="telebyte", log_path=None):
+        """
+        :type logger: logging.Logger
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        :param driver_name: logs sub folder
+        :param log_path: logs folder, LOG_PATH environment variable by default
+        """
+
+        self._logger = logger
+        self.enabled = bool(runtime_config.read_key("JOURNAL.ENABLED", False))
+        self._max_records = int(runtime_config.read_key("JOURNAL.MAX_RECORDS", self.MAX_RECORDS))
+        self._journal_path = os.path.join(log_path or os.environ.get("LOG_PATH", "."), driver_name, "journal")
+        self._journals = {}
+        self._lock = Lock()
+
+    def _get(self, address):
+        with self._lock:
+            if address not in self._journals:
+                if not os.path.exists(self._journal_path):
+                    os.makedirs(self._journal_path)
+                journal = ChassisJournal(os.path.join(self._journal_path, "{}.journal".format(address)),
+                                         self._max_records, self._logger)
+                self._journals[address] = journal
+                self._logger.info("Mapping journal of {} loaded, sequence {}, {} connections".format(
+                    address, journal.sequence, sum(len(ports) for ports in journal.get_connections().values())))
+            return self._journals[address]
+
+    def record(self, address, slot_id, out_port, in_port):
+        """ Record accepted connection change, returns when the record is on disk
+        :param in_port: input port number, 0 if the output port was disconnected
+        :return: sequence of the record, None if journal is disabled
+        """
+
+        if not self.enabled:
+            return None
+
+        operation = self.CONNECT if in_port else self.TERMINATE
+        return self._get(address).append([(int(slot_id), PortIndex.normalize_port(out_port), int(in_port))],
+                                         operation)
+
+    def slot_sequence(self, address, slot_id):
+        """ Sequence of the last record of the slot, should be taken before reading the slot for sync_slot """
+
+        return self._get(address).slot_sequence(int(slot_id)) if self.enabled else 0
+
+    def sync_slot(self, address, slot_id, connections, since_sequence=None):
+        """ Record differences between the journal and the slot connections read from the device
+
+        Nothing is recorded if the slot was changed after since_sequence, the connections read
+        before that change are not up to date any more
+        :param connections: {output port: input port}, input port 0 if not connected
+        :param since_sequence: slot_sequence taken before the connections were read
+        :return: recorded changes, None if journal is disabled or the slot was changed
+        :rtype: list[tuple]
+        """
+
+        if not self.enabled:
+            return None
+
+        actual = {PortIndex.normalize_port(out_port): int(in_port)
+                  for out_port, in_port in connections.items() if int(in_port)}
+        return self._get(address).sync_slot(int(slot_id), actual, self.SYNC, since_sequence)
+
+    def changes_since(self, address, sequence):
+        """ What changed since the sequence, applying the records to the connections known at the sequence
+        gives the current ones
+        :param sequence: last_sequence taken before, 0 for all records
+        :return: records ordered by sequence, empty list if journal is disabled
+        :rtype: list[JournalRecord]
+        """
+
+        if not self.enabled:
+            return []
+        return self._get(address).changes_since(int(sequence))
+
+    def get_connections(self, address):
+        """
+        :return: connections known from the journal, {slot ID: {output port: input port}}
+        """
+
+        if not self.enabled:
+            return {}
+        return self._get(address).get_connections()
+
+    def last_sequence(self, address):
+        return self._get(address).sequence if self.enabled else 0
+
+    def close(self):
+        with self._lock:
+            for journal in self._journals.values():
+                journal.close()
+            self._journals = {}
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import struct
+import time
+from threading import Event, Lock, Thread
+
+from telebyte.exceptions.telebyte_exceptions import InvalidSlotNumberException
+from telebyte.helpers.port_index import PortIndex
+from telebyte.helpers.ring_buffer import SampleRingBuffer
+
+
+class OpticalSampler(object):
+    """ Periodically read Rx/Tx power and wavelength of all chassis ports into per port ring buffers
+
+    Every chassis is sampled by its own thread with its own CLI handler, one bulk command per slot.
+    Buffers are flushed to <LOG_PATH>/<driver>/optics/<address>-<date>.bin as fixed size records
+
+    Telebyte CLI command reporting port optical levels is not confirmed yet, read_slot is not implemented
+    and SAMPLER.ENABLED is ignored until it is
+    """
+
+    FIELDS = ("rx_power", "tx_power", "wavelength")
+    INTERVAL = 60
+    BUFFER_SIZE = 1440
+    FLUSH_INTERVAL = 600
+    # set when read_slot sends the chassis optics command
+    SUPPORTED = False
+    # time, slot, port, rx power, tx power, wavelength
+    RECORD = struct.Struct("<dB4s3f")
+
+    def __init__(self, logger, runtime_config, driver_name="telebyte", log_path=None):
+        """
+        :type logger: logging.Logger
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        :param driver_name: logs sub folder
+        :param log_path: logs folder, LOG_PATH environment variable by default
+        """
+
+        self._logger = logger
+        enabled = bool(runtime_config.read_key("SAMPLER.ENABLED", False))
+        if enabled and not self.SUPPORTED:
+            logger.warning("SAMPLER.ENABLED is ignored, reading port optical levels is not supported yet")
+        self.enabled = enabled and self.SUPPORTED
+        self._interval = float(runtime_config.read_key("SAMPLER.INTERVAL", self.INTERVAL))
+        self._buffer_size = int(runtime_config.read_key("SAMPLER.BUFFER_SIZE", self.BUFFER_SIZE))
+        self._flush_interval = float(runtime_config.read_key("SAMPLER.FLUSH_INTERVAL", self.FLUSH_INTERVAL))
+        self._optics_path = os.path.join(log_path or os.environ.get("LOG_PATH", "."), driver_name, "optics")
+        self._buffers = {}
+        self._flushed = {}
+        self._chassis = {}
+        self._lock = Lock()
+        self._flush_lock = Lock()
+
+    def is_running(self, address):
+        chassis = self._chassis.get(address)
+        return chassis is not None and chassis["thread"].is_alive()
+
+    def start(self, address, cli_handler, slot_ids):
+        """ Start sampling the chassis, nothing is done if sampler is disabled
+        :param address: chassis address
+        :param cli_handler: CLI handler with defined session attributes, used by the sampler only
+        :type cli_handler: telebyte.cli.telebyte_cli_handler.TelebyteCliHandler
+        :param slot_ids: installed slots
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self.is_running(address):
+                self._chassis[address]["slot_ids"] = list(slot_ids)
+                return
+
+            chassis = {"cli_handler": cli_handler, "slot_ids": list(slot_ids), "stop": Event()}
+            chassis["thread"] = Thread(target=self._run, args=(address, chassis), name="optics-{}".format(address))
+            chassis["thread"].daemon = True
+            self._chassis[address] = chassis
+            chassis["thread"].start()
+        self._logger.info("Optical sampling of {} started, slots {}".format(address, chassis["slot_ids"]))
+
+    def stop(self):
+        """ Stop all sampling threads, samples are flushed by each thread on exit """
+
+        with self._lock:
+            chassis_list = list(self._chassis.values())
+            self._chassis.clear()
+        for chassis in chassis_list:
+            chassis["stop"].set()
+        for chassis in chassis_list:
+            chassis["thread"].join()
+
+    def _run(self, address, chassis):
+        last_flush = time.time()
+        while True:
+            try:
+                with chassis["cli_handler"].default_mode_service() as session:
+                    self.sample(address, session, chassis["slot_ids"])
+            except Exception:
+                self._logger.exception("Failed to sample optical levels of {}".format(address))
+
+            if time.time() - last_flush >= self._flush_interval:
+                self.flush()
+                last_flush = time.time()
+            if chassis["stop"].wait(self._interval):
+                break
+        self.flush()
+
+    def read_slot(self, session, slot_id):
+        """ Read optical levels of all slot ports
+        :type session: telebyte.cli.telebyte_cli_service.TelebyteCliService
+        :return: {port id: (rx power, tx power, wavelength)}
+        :raises InvalidSlotNumberException: if slot is not installed
+        """
+
+        raise NotImplementedError("Telebyte optics command is not confirmed")
+
+    def sample(self, address, session, slot_ids):
+        """ Read all ports of the slots once
+        :type session: telebyte.cli.telebyte_cli_service.TelebyteCliService
+        """
+
+        for slot_id in slot_ids:
+            try:
+                optics = self.read_slot(session, slot_id)
+            except InvalidSlotNumberException:
+                continue
+            self.add_samples(address, slot_id, optics)
+
+    def add_samples(self, address, slot_id, optics, timestamp=None):
+        """ Store slot sample
+        :param optics: {port id: (rx power, tx power, wavelength)}
+        """
+
+        timestamp = timestamp or time.time()
+        for port, values in optics.items():
+            self._get_buffer(address, slot_id, port, create=True).append(dict(zip(self.FIELDS, values)), timestamp)
+
+    def _get_buffer(self, address, slot_id, port, create=False):
+        key = (address, int(slot_id), PortIndex.normalize_port(port))
+        buffer = self._buffers.get(key)
+        if buffer is None and create:
+            with self._lock:
+                buffer = self._buffers.setdefault(key, SampleRingBuffer(self._buffer_size, self.FIELDS))
+        return buffer
+
+    def latest(self, address, slot_id, port):
+        """ The newest sample of the port
+        :return: dict of the sampled fields and time, None if port was not sampled
+        """
+
+        buffer = self._get_buffer(address, slot_id, port)
+        return buffer.latest() if buffer else None
+
+    def stats(self, address, slot_id, port, field, window=None):
+        """ Min, max and average of the port field over the time window, no device commands are executed
+        :param field: one of FIELDS
+        :param window: seconds, the whole buffer by default
+        :return: min, max, average or None
+        """
+
+        buffer = self._get_buffer(address, slot_id, port)
+        return buffer.stats(field, window) if buffer else None
+
+    def flush(self):
+        """ Append samples taken since the previous flush to the chassis files """
+
+        with self._flush_lock:
+            records = {}
+            for key, buffer in list(self._buffers.items()):
+                address, slot_id, port = key
+                samples = buffer.samples(since=self._flushed.get(key, 0))
+                if not samples:
+                    continue
+                self._flushed[key] = samples[-1][0]
+                port_name = str(port).encode("ascii")
+                records.setdefault(address, []).extend(
+                    self.RECORD.pack(sample[0], slot_id, port_name, *sample[1:]) for sample in samples)
+
+            if not records:
+                return
+
+            if not os.path.exists(self._optics_path):
+                os.makedirs(self._optics_path)
+            for address, address_records in records.items():
+                file_path = os.path.join(self._optics_path, "{}-{}.bin".format(address, time.strftime("%Y%m%d")))
+                with open(file_path, "ab") as optics_file:
+                    optics_file.write(b"".join(address_records))
+
+    @classmethod
+    def read_records(cls, file_path):
+        """ Read flushed samples
+        :return: list of (time, slot ID, port, rx power, tx power, wavelength)
+        """
+
+        with open(file_path, "rb") as optics_file:
+            data = optics_file.read()
+
+        records = []
+        for offset in range(0, len(data) - cls.RECORD.size + 1, cls.RECORD.size):
+            timestamp, slot_id, port, rx_power, tx_power, wavelength = cls.RECORD.unpack_from(data, offset)
+            port = PortIndex.normalize_port(port.rstrip(b"\0").decode("ascii"))
+            records.append((timestamp, slot_id, port, rx_power, tx_power, wavelength))
+        return records
@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import string
+from collections import namedtuple
+from threading import Lock
+
+from telebyte.exceptions.telebyte_exceptions import InvalidPortException
+
+
+class PortRecord(namedtuple("PortRecord", ["slot_id", "out_port", "in_port"])):
+    """ Typed port address, exactly one of out_port (letter) and in_port (number) is set """
+
+    __slots__ = ()
+
+    @property
+    def is_output(self):
+        return self.out_port is not None
+
+    @property
+    def port_id(self):
+        """ Port identifier as it is used in CloudShell resource address """
+        return self.out_port if self.is_output else self.in_port
+
+
+class SlotPorts(namedtuple("SlotPorts", ["outputs", "inputs"])):
+    """ Slot port records, output ports by number (A is 1) and input ports by number """
+
+    __slots__ = ()
+
+    @property
+    def records(self):
+        return self.outputs + self.inputs
+
+
+class PortIndex(object):
+    """ Index of chassis port addresses "address/blade/port", built during autoload
+
+    Output ports are named by letters as the device does, A..Z, AA..AZ, BA and so on
+    """
+
+    LETTERS = string.ascii_uppercase
+
+    def __init__(self):
+        self._slots = {}
+        self._indexed = set()
+        self._lock = Lock()
+
+    @classmethod
+    def out_port_name(cls, port_number):
+        """ Output port name by its 1-based number, 1 -> "A", 26 -> "Z", 27 -> "AA" """
+
+        name = ""
+        while port_number > 0:
+            port_number, remainder = divmod(port_number - 1, len(cls.LETTERS))
+            name = cls.LETTERS[remainder] + name
+        return name
+
+    @classmethod
+    def out_port_number(cls, port_name):
+        """ Output port 1-based number by its name, "AA" -> 27, 0 if the name is not valid """
+
+        number = 0
+        for letter in port_name.upper():
+            position = cls.LETTERS.find(letter)
+            if position < 0:
+                return 0
+            number = number * len(cls.LETTERS) + position + 1
+        return number
+
+    @staticmethod
+    def normalize_port(port):
+        """ Normalize port identifier, "b" -> "B", "01" -> 1 """
+
+        port = str(port).strip()
+        if port.isdigit():
+            return int(port)
+        return port.upper()
+
+    @staticmethod
+    def split_address(port_address):
+        """ Split CloudShell port address "192.168.42.240/1/A" into address, slot ID and port """
+
+        address_parts = port_address.split("/")
+        if len(address_parts) != 3 or not address_parts[1].strip().isdigit():
+            raise InvalidPortException("Incorrect port address {}".format(port_address))
+
+        address, slot_id, port = address_parts
+        return address, int(slot_id), PortIndex.normalize_port(port)
+
+    def is_indexed(self, address):
+        return address in self._indexed
+
+    def clear(self, address):
+        """ Drop all records of the chassis """
+
+        with self._lock:
+            self._indexed.discard(address)
+            self._slots.pop(address, None)
+
+    def retain_slots(self, address, slot_ids):
+        """ Drop the slots not found by the latest autoload, the others are replaced in place """
+
+        with self._lock:
+            slots = self._slots.get(address, {})
+            for slot_id in [slot_id for slot_id in slots if slot_id not in slot_ids]:
+                del slots[slot_id]
+
+    def add_slot(self, address, slot_id, out_ports, in_ports):
+        """ Register slot ports
+        :param address: chassis address, "192.168.42.240"
+        :param slot_id: slot number
+        :type slot_id: int
+        :param out_ports: count of output ports, named by letters
+        :param in_ports: count of input ports, named by numbers
+        :return: registered records, output ports first
+        :rtype: list[PortRecord]
+        """
+
+        slot_ports = SlotPorts([PortRecord(slot_id, self.out_port_name(i), None) for i in range(1, out_ports + 1)],
+                               [PortRecord(slot_id, None, i) for i in range(1, in_ports + 1)])
+
+        with self._lock:
+            # slot is replaced at once, concurrent lookups see either old or new ports
+            self._slots.setdefault(address, {})[slot_id] = slot_ports
+
+        return slot_ports.records
+
+    def mark_indexed(self, address):
+        """ Mark chassis as indexed even if no slot was registered """
+
+        with self._lock:
+            self._slots.setdefault(address, {})
+            self._indexed.add(address)
+
+    def _find(self, address, slot_id, port):
+        slot_ports = self._slots.get(address, {}).get(slot_id)
+        if slot_ports is None:
+            return None
+
+        if isinstance(port, int):
+            ports, number = slot_ports.inputs, port
+        else:
+            ports, number = slot_ports.outputs, self.out_port_number(port)
+        return ports[number - 1] if 0 < number <= len(ports) else None
+
+    def get(self, address, slot_id, port):
+        """ Find port record, None if port is not registered """
+
+        return self._find(address, int(slot_id), self.normalize_port(port))
+
+    def get_slot_ids(self, address):
+        return sorted(self._slots.get(address, {}))
+
+    def get_slot_ports(self, address, slot_id):
+        slot_ports = self._slots.get(address, {}).get(int(slot_id))
+        return slot_ports.records if slot_ports else []
+
+    def resolve(self, port_address):
+        """ Validate and normalize CloudShell port address
+        :param port_address: "192.168.42.240/1/A"
+        :rtype: PortRecord
+        :raises InvalidPortException: if port is not registered
+        """
+
+        address, slot_id, port = self.split_address(port_address)
+        record = self._find(address, slot_id, port)
+        if record is None:
+            if slot_id not in self._slots.get(address, {}):
+                raise InvalidPortException("Slot {} is not found on {}".format(slot_id, address))
+            raise InvalidPortException("Port {} is not found on {} slot {}".format(port, address, slot_id))
+
+        return record
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import cProfile
+import os
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+
+try:
+    import tracemalloc
+except ImportError:
+    # not available on Python 2
+    tracemalloc = None
+
+
+class CommandProfiler(object):
+    """ Profile driver commands with cProfile and optional tracemalloc snapshots
+
+    Profiles are written to <LOG_PATH>/<driver>/profiles, one file per profiled command
+    """
+
+    SAMPLE_RATE = 1.0
+    MAX_FILES = 100
+    MAX_SIZE_MB = 50
+    TOP_MEMORY_STATS = 30
+
+    def __init__(self, logger, runtime_config, driver_name="telebyte", log_path=None):
+        """
+        :type logger: logging.Logger
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        :param driver_name: logs sub folder
+        :param log_path: logs folder, LOG_PATH environment variable by default
+        """
+
+        self._logger = logger
+        self.enabled = bool(runtime_config.read_key("PROFILING.ENABLED", False))
+        self._sample_rate = float(runtime_config.read_key("PROFILING.SAMPLE_RATE", self.SAMPLE_RATE))
+        self._max_files = int(runtime_config.read_key("PROFILING.MAX_FILES", self.MAX_FILES))
+        self._max_size = float(runtime_config.read_key("PROFILING.MAX_SIZE_MB", self.MAX_SIZE_MB)) * 1024 * 1024
+        self._trace_memory = bool(runtime_config.read_key("PROFILING.TRACEMALLOC", False))
+        self._profiles_path = os.path.join(log_path or os.environ.get("LOG_PATH", "."), driver_name, "profiles")
+        self._lock = Lock()
+
+        if self.enabled and self._trace_memory:
+            if tracemalloc is None:
+                self._logger.warning("Memory snapshots are not supported by this Python version")
+                self._trace_memory = False
+            elif not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def wrap_commands(self, instance, command_names):
+        """ Replace instance methods with profiled ones, nothing is changed if profiling is disabled
+        :param instance: driver commands instance
+        :param command_names: names of the methods to profile
+        """
+
+        if not self.enabled:
+            return
+
+        for command_name in command_names:
+            setattr(instance, command_name, self.wrap(getattr(instance, command_name)))
+
+    def wrap(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.profile(func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @contextmanager
+    def profile(self, command_name):
+        """ Profile code block if it gets into the sample """
+
+        if not self.enabled or random.random() >= self._sample_rate:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        start_time = time.time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            snapshot = tracemalloc.take_snapshot() if self._trace_memory else None
+            try:
+                self._save(command_name, start_time, profile, snapshot)
+            except Exception:
+                self._logger.exception("Failed to save profile for {}".format(command_name))
+
+    def _save(self, command_name, start_time, profile, snapshot):
+        file_prefix = os.path.join(self._profiles_path, "{}-{:03d}--{}--{}".format(
+            time.strftime("%d-%b-%Y--%H-%M-%S", time.localtime(start_time)), int(start_time % 1 * 1000),
+            command_name, os.getpid()))
+
+        with self._lock:
+            if not os.path.isdir(self._profiles_path):
+                os.makedirs(self._profiles_path)
+
+            profile.dump_stats(file_prefix + ".prof")
+            if snapshot is not None:
+                with open(file_prefix + ".mem.txt", "w") as memory_file:
+                    for stat in snapshot.statistics("lineno")[:self.TOP_MEMORY_STATS]:
+                        memory_file.write("{}\n".format(stat))
+
+            self._logger.debug("Command {} profiled in {:.3f}s, saved to {}".format(
+                command_name, time.time() - start_time, file_prefix))
+            self._apply_limits()
+
+    def _apply_limits(self):
+        """ Remove the oldest profiles exceeding files count or size limits """
+
+        files = []
+        for file_name in os.listdir(self._profiles_path):
+            file_path = os.path.join(self._profiles_path, file_name)
+            files.append((os.path.getmtime(file_path), os.path.getsize(file_path), file_path))
+        files.sort()
+
+        total_size = sum(size for _, size, _ in files)
+        while files and (len(files) > self._max_files or total_size > self._max_size):
+            _, size, file_path = files.pop(0)
+            os.remove(file_path)
+            total_size -= size
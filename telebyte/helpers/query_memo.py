@@ -0,0 +1,79 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+from copy import copy
+from functools import wraps
+from threading import Lock
+
+
+class QueryMemo(object):
+    """ Short-lived results of read-only device queries, keyed by chassis, query name and slot ID
+
+    Results are reused for TTL seconds, so back-to-back commands like Login and GetResourceDescription
+    don't repeat the same queries. Mapping writes invalidate the slot results, a query running while
+    the chassis is changed is not stored.
+    """
+
+    TTL = 5
+
+    def __init__(self, runtime_config):
+        """
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        """
+
+        self._ttl = float(runtime_config.read_key("MEMO.TTL", self.TTL))
+        self._results = {}
+        self._generations = {}
+        self._lock = Lock()
+
+    def get(self, host, name, slot_id, query):
+        """ Query result, taken from memo if it is not expired
+        :param query: function executing the query
+        """
+
+        if self._ttl <= 0:
+            return query()
+
+        key = (host, name, slot_id)
+        start_time = time.time()
+        with self._lock:
+            result = self._results.get(key)
+            generation = self._generations.get(host, 0)
+        if result is not None and start_time - result[0] < self._ttl:
+            return copy(result[1])
+
+        value = query()
+        with self._lock:
+            if self._generations.get(host, 0) == generation:
+                self._results[key] = (start_time, value)
+        return copy(value)
+
+    def invalidate(self, host, slot_id=None):
+        """ Drop results of the slot, all chassis results if slot ID is not set """
+
+        with self._lock:
+            self._generations[host] = self._generations.get(host, 0) + 1
+            for key in [key for key in self._results
+                        if key[0] == host and (slot_id is None or key[2] == int(slot_id))]:
+                del self._results[key]
+
+
+def memoized(func):
+    """ Decorator of actions methods reusing the results kept by the actions query memo
+
+    The actions should have _cli_service with host and _query_memo attributes, slot_id is the only
+    query argument taken into account
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        query_memo = self._query_memo
+        if query_memo is None:
+            return func(self, *args, **kwargs)
+
+        slot_id = kwargs.get("slot_id", args[0] if args else None)
+        return query_memo.get(self._cli_service.host, func.__name__, None if slot_id is None else int(slot_id),
+                              lambda: func(self, *args, **kwargs))
+
+    return wrapper
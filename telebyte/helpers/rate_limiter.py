@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from telebyte.exceptions.telebyte_exceptions import RateLimitException
+from telebyte.helpers.slot_locks import FairLock
+from telebyte.helpers.tracing import record_span
+
+
+class TokenBucket(object):
+    """ Token bucket, callers wait for tokens in the order they came """
+
+    def __init__(self, rate, burst):
+        """
+        :param rate: tokens added per second
+        :param burst: bucket size
+        """
+
+        self._rate = float(rate)
+        self._burst = float(max(burst, 1))
+        self._tokens = self._burst
+        self._update_time = time.time()
+        self._queue = FairLock()
+
+    def acquire(self, max_wait=None):
+        """ Take a token, waiting for it if the bucket is empty
+        :param max_wait: seconds, waits as long as needed by default
+        :return: seconds waited
+        :raises RateLimitException: if the token is not available within max_wait
+        """
+
+        start_time = time.time()
+        with self._queue:
+            now = time.time()
+            self._tokens = min(self._burst, self._tokens + (now - self._update_time) * self._rate)
+            self._update_time = now
+
+            wait_time = (1 - self._tokens) / self._rate if self._tokens < 1 else 0
+            if max_wait is not None and now - start_time + wait_time > max_wait:
+                raise RateLimitException("Command rate limit exceeded, next command is allowed in {:.1f}s".format(
+                    wait_time))
+            if wait_time:
+                time.sleep(wait_time)
+                self._tokens, self._update_time = 1, time.time()
+            self._tokens -= 1
+        return time.time() - start_time
+
+
+class ConcurrencyLimit(object):
+    """ Counting semaphore with timeout """
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._count = 0
+        self._condition = Condition(Lock())
+
+    def acquire(self, max_wait=None):
+        """
+        :return: seconds waited
+        :raises RateLimitException: if no slot is released within max_wait
+        """
+
+        start_time = time.time()
+        with self._condition:
+            while self._count >= self._limit:
+                remaining = None if max_wait is None else max_wait - (time.time() - start_time)
+                if remaining is not None and remaining <= 0:
+                    raise RateLimitException("Concurrent sessions limit {} exceeded".format(self._limit))
+                self._condition.wait(remaining)
+            self._count += 1
+        return time.time() - start_time
+
+    def release(self):
+        with self._condition:
+            self._count -= 1
+            self._condition.notify()
+
+
+class RateLimiter(object):
+    """ Per chassis limits of CLI commands rate and concurrent sessions
+
+    Callers exceeding the limits wait in queue, RateLimitException is raised if the wait would exceed MAX_WAIT
+    """
+
+    COMMANDS_PER_SECOND = 0
+    BURST = 5
+    SESSIONS = 0
+    MAX_WAIT = 60
+
+    def __init__(self, runtime_config):
+        """
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        """
+
+        self._rate = float(runtime_config.read_key("RATE_LIMIT.COMMANDS_PER_SECOND", self.COMMANDS_PER_SECOND))
+        self._burst = int(runtime_config.read_key("RATE_LIMIT.BURST", self.BURST))
+        self._sessions = int(runtime_config.read_key("RATE_LIMIT.SESSIONS", self.SESSIONS))
+        self._max_wait = float(runtime_config.read_key("RATE_LIMIT.MAX_WAIT", self.MAX_WAIT))
+        self._buckets = {}
+        self._session_limits = {}
+        self._lock = Lock()
+
+    def _get(self, limits, host, factory):
+        with self._lock:
+            if host not in limits:
+                limits[host] = factory()
+            return limits[host]
+
+    def acquire_command(self, host):
+        """ Wait until the chassis may get the next command """
+
+        if self._rate <= 0:
+            return
+
+        bucket = self._get(self._buckets, host, lambda: TokenBucket(self._rate, self._burst))
+        start_time = time.time()
+        if bucket.acquire(self._max_wait) > 0.001:
+            record_span("rate_limit", start_time)
+
+    @contextmanager
+    def session(self, host):
+        """ Hold one of the chassis concurrent sessions for the code block """
+
+        if self._sessions <= 0:
+            yield
+            return
+
+        limit = self._get(self._session_limits, host, lambda: ConcurrencyLimit(self._sessions))
+        start_time = time.time()
+        if limit.acquire(self._max_wait) > 0.001:
+            record_span("session_limit", start_time)
+        try:
+            yield
+        finally:
+            limit.release()
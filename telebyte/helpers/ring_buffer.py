@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+from array import array
+from threading import Lock
+
+
+class SampleRingBuffer(object):
+    """ Fixed size ring buffer of timestamped samples, each field is kept in its own array """
+
+    TIME = "time"
+
+    def __init__(self, size, fields):
+        """
+        :param size: max count of samples, the oldest ones are overwritten
+        :param fields: names of the sampled values, "rx_power", "tx_power", etc
+        """
+
+        self._size = size
+        self._fields = (self.TIME,) + tuple(fields)
+        self._arrays = {field: array("d", [0.0] * size) for field in self._fields}
+        self._head = 0
+        self._count = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def fields(self):
+        return self._fields[1:]
+
+    def append(self, values, timestamp=None):
+        """ Add sample
+        :param values: value for each field
+        :type values: dict
+        :param timestamp: sample time, current time by default
+        """
+
+        with self._lock:
+            self._arrays[self.TIME][self._head] = timestamp or time.time()
+            for field in self.fields:
+                self._arrays[field][self._head] = values[field]
+            self._head = (self._head + 1) % self._size
+            self._count = min(self._count + 1, self._size)
+
+    def _indexes(self, count):
+        """ Indexes of the last samples, oldest first """
+
+        start = self._head - count
+        return [(start + i) % self._size for i in range(count)]
+
+    def samples(self, last=None, since=None):
+        """ Samples oldest first
+        :param last: count of the newest samples
+        :param since: only samples taken after this time
+        :return: list of tuples (time, field values...)
+        """
+
+        with self._lock:
+            count = self._count if last is None else min(last, self._count)
+            rows = [tuple(self._arrays[field][i] for field in self._fields) for i in self._indexes(count)]
+
+        if since is not None:
+            rows = [row for row in rows if row[0] > since]
+        return rows
+
+    def latest(self):
+        rows = self.samples(last=1)
+        return dict(zip(self._fields, rows[0])) if rows else None
+
+    def stats(self, field, window=None):
+        """ Min, max and average of the field over the time window
+        :param field: field name
+        :param window: seconds, all samples by default
+        :return: min, max, average or None if there are no samples
+        """
+
+        index = self._fields.index(field)
+        since = time.time() - window if window else None
+        values = [row[index] for row in self.samples(since=since)]
+        if not values:
+            return None
+        return min(values), max(values), sum(values) / len(values)
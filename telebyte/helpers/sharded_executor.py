@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import importlib
+import itertools
+import multiprocessing
+import os
+import pickle
+import zlib
+from threading import Event, Lock, Thread, local
+
+from cloudshell.core.logger.qs_logger import get_qs_logger
+from cloudshell.layer_one.core.command_executor import CommandExecutor
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
+from cloudshell.layer_one.core.layer_one_driver_exception import LayerOneDriverException
+
+from telebyte.helpers.startup_report import StartupReport
+from telebyte.helpers.tracing import Tracer, current_trace_id
+
+
+def _execute_commands(command_executor, tracer, request_id, trace_id, command_requests, response_queue, logger):
+    try:
+        with tracer.trace("worker", trace_id, detail=str(request_id)):
+            responses = command_executor.execute_commands(command_requests)
+        responses = pickle.dumps(responses, pickle.HIGHEST_PROTOCOL)
+        error = None
+    except Exception as e:
+        logger.exception("Failed to execute request {}".format(request_id))
+        responses = None
+        error = str(e) or e.__class__.__name__
+    response_queue.put((request_id, responses, error))
+
+
+def run_worker(driver_name, config_path, log_path, worker_id, request_queue, response_queue):
+    """ Worker process entry point, executes requests with its own driver instance
+
+    Every request is executed in a separate thread, as it is done by the driver listener
+    """
+
+    os.environ['LOG_PATH'] = log_path
+    # worker report starts here, module imports of the worker process are not included
+    startup_report = StartupReport()
+    with startup_report.phase('config'):
+        runtime_config = RuntimeConfiguration(config_path)
+
+    logger = get_qs_logger(log_group=driver_name, log_file_prefix='{}_commands_worker{}'.format(driver_name, worker_id),
+                           log_category='COMMANDS')
+    logger.setLevel(runtime_config.read_key('LOGGING.LEVEL', 'INFO'))
+    logger.info('Starting worker {0}, PID: {1}'.format(worker_id, os.getpid()))
+
+    with startup_report.phase('driver_import'):
+        driver_commands = importlib.import_module('{}.driver_commands'.format(driver_name), package=None)
+    with startup_report.phase('driver_init'):
+        command_executor = CommandExecutor(driver_commands.DriverCommands(logger, runtime_config), logger)
+    tracer = Tracer(logger, runtime_config, driver_name, log_path)
+    logger.info(startup_report.report())
+
+    while True:
+        request = request_queue.get()
+        if request is None:
+            break
+
+        request_id, trace_id, command_requests = request
+        thread = Thread(target=_execute_commands,
+                        args=(command_executor, tracer, request_id, trace_id, command_requests, response_queue, logger))
+        thread.daemon = True
+        thread.start()
+
+
+class ShardedCommandExecutor(object):
+    """ Route command requests to worker processes by chassis address
+
+    Used by the driver listener in place of CommandExecutor, requests of one chassis are always
+    executed by the same worker, so busy chassis don't slow down the others. Exited worker is restarted,
+    the requests it was executing fail
+    """
+
+    ADDRESS_PARAMS = ("Address", "MapPort_A", "MapPort_B", "MapPort", "SrcPort", "DstPort")
+    WORKER_CHECK_INTERVAL = 1
+
+    def __init__(self, driver_name, config_path, log_path, workers_count, logger):
+        """
+        :param driver_name: driver package name
+        :param config_path: runtime configuration file, read by each worker
+        :param log_path: logs folder
+        :param workers_count: count of worker processes
+        :type logger: logging.Logger
+        """
+
+        self._logger = logger
+        self._lock = Lock()
+        self._pending = {}
+        self._request_ids = itertools.count()
+        self._connection = local()
+        self._response_queue = multiprocessing.Queue()
+
+        self._worker_args = (driver_name, config_path, log_path)
+        self._workers = [self._start_worker(worker_id) for worker_id in range(workers_count)]
+
+        dispatcher = Thread(target=self._dispatch_responses, name='response-dispatcher')
+        dispatcher.daemon = True
+        dispatcher.start()
+
+    def _start_worker(self, worker_id):
+        """ Start worker process with its own request queue
+        :return: process and request queue
+        """
+
+        driver_name, config_path, log_path = self._worker_args
+        request_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_worker, name='{}-worker{}'.format(driver_name, worker_id),
+                                          args=(driver_name, config_path, log_path, worker_id, request_queue,
+                                                self._response_queue))
+        process.daemon = True
+        process.start()
+        return process, request_queue
+
+    def _restart_worker(self, worker_id, process):
+        """ Replace exited worker process, nothing is done if it was replaced already
+
+        The new worker gets a new request queue, requests sent to the exited one are failed by their callers
+        """
+
+        with self._lock:
+            if self._workers[worker_id][0] is not process:
+                return
+            self._logger.error('Worker {} exited with code {}, restarting it'.format(worker_id, process.exitcode))
+            self._workers[worker_id] = self._start_worker(worker_id)
+
+    @classmethod
+    def get_chassis_address(cls, command_requests):
+        """ Chassis address of the first command referring to an address or a port """
+
+        for command_request in command_requests:
+            for param in cls.ADDRESS_PARAMS:
+                for value in command_request.command_params.get(param) or []:
+                    if value:
+                        return value.split('/')[0]
+        return None
+
+    def get_worker_id(self, address):
+        return (zlib.crc32(address.encode('utf-8')) & 0xffffffff) % len(self._workers)
+
+    def _dispatch_responses(self):
+        while True:
+            request_id, responses, error = self._response_queue.get()
+            with self._lock:
+                pending = self._pending.get(request_id)
+            if pending:
+                pending[1:] = [responses, error]
+                pending[0].set()
+
+    def execute_commands(self, command_requests):
+        """ Execute list of command requests on the worker owning the chassis
+
+        Commands without address (GetStateId, etc) go to the worker of the last chassis
+        used by the same connection
+        """
+
+        address = self.get_chassis_address(command_requests)
+        if address:
+            self._connection.address = address
+        else:
+            address = getattr(self._connection, 'address', '')
+
+        worker_id = self.get_worker_id(address)
+        process, request_queue = self._workers[worker_id]
+        if not process.is_alive():
+            self._restart_worker(worker_id, process)
+            process, request_queue = self._workers[worker_id]
+        request_id = next(self._request_ids)
+        pending = [Event(), None, None]
+        with self._lock:
+            self._pending[request_id] = pending
+
+        self._logger.debug('Request {} for "{}" routed to worker {}'.format(request_id, address, worker_id))
+        try:
+            request_queue.put((request_id, current_trace_id(), command_requests))
+            while not pending[0].wait(self.WORKER_CHECK_INTERVAL):
+                if not process.is_alive():
+                    self._restart_worker(worker_id, process)
+                    raise LayerOneDriverException(self.__class__.__name__,
+                                                  'Worker {} exited with code {}, the request may be partly executed'
+                                                  .format(worker_id, process.exitcode))
+        finally:
+            with self._lock:
+                del self._pending[request_id]
+
+        _, responses, error = pending
+        if error:
+            raise Exception(error)
+        return pickle.loads(responses)
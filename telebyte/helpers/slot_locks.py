@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+from telebyte.helpers.tracing import span
+
+
+class FairLock(object):
+    """ Lock granted in the order of acquire calls """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._next_ticket = 0
+        self._serving = 0
+
+    def acquire(self):
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._serving:
+                self._condition.wait()
+
+    def release(self):
+        with self._condition:
+            self._serving += 1
+            self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class SlotLockManager(object):
+    """ Locks keyed by chassis address and slot ID
+
+    Commands for the same slot are executed one by one in the order they came, different slots run in parallel.
+    A lock is kept only while commands use or wait for it, so the count of locks doesn't grow with the count
+    of chassis and slots seen by the driver.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._users = {}
+        self._lock = Lock()
+
+    def _get_locks(self, keys):
+        with self._lock:
+            for key in keys:
+                if key not in self._locks:
+                    self._locks[key] = FairLock()
+                self._users[key] = self._users.get(key, 0) + 1
+            return [self._locks[key] for key in keys]
+
+    def _put_locks(self, keys):
+        with self._lock:
+            for key in keys:
+                self._users[key] -= 1
+                if not self._users[key]:
+                    del self._users[key]
+                    del self._locks[key]
+
+    @contextmanager
+    def lock(self, slots):
+        """ Lock slots for the code block
+        :param slots: chassis address and slot ID pairs, [("192.168.42.240", 1)]
+        """
+
+        # locks are always taken in the same order, so requests for several slots can't deadlock
+        keys = sorted({(address, int(slot_id)) for address, slot_id in slots})
+        locks = self._get_locks(keys)
+        acquired = []
+        try:
+            with span("slot_lock", ",".join(str(slot_id) for _, slot_id in keys)):
+                for lock in locks:
+                    lock.acquire()
+                    acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            self._put_locks(keys)
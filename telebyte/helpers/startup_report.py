@@ -0,0 +1,43 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import time
+from contextlib import contextmanager
+
+
+class StartupReport(object):
+    """ Durations of driver startup phases, logged when the driver starts listening """
+
+    def __init__(self, start_time=None):
+        """
+        :param start_time: startup start, current time by default
+        """
+
+        self._start_time = start_time or time.time()
+        self._phases = []
+
+    @contextmanager
+    def phase(self, name):
+        """ Time startup phase """
+
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.time() - start_time))
+
+    @property
+    def phases(self):
+        """
+        :return: phase names and durations in seconds, in the order they ran
+        :rtype: list[tuple]
+        """
+
+        return list(self._phases)
+
+    def report(self):
+        """ Startup summary, "Driver startup took 0.412s: config 0.004s, loggers 0.021s, ..." """
+
+        return "Driver startup took {:.3f}s: {}".format(
+            time.time() - self._start_time,
+            ", ".join("{} {:.3f}s".format(name, duration) for name, duration in self._phases))
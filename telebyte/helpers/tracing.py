@@ -0,0 +1,265 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, local
+
+_context = local()
+
+
+class Span(object):
+    __slots__ = ("span_id", "parent_id", "name", "detail", "start_time", "end_time", "children_time")
+
+    def __init__(self, span_id, parent_id, name, detail, start_time):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.detail = detail
+        self.start_time = start_time
+        self.end_time = None
+        self.children_time = 0.0
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+
+class Trace(object):
+    """ Spans of one request, collected by the thread executing it """
+
+    def __init__(self, trace_id, name, detail=""):
+        self.trace_id = trace_id
+        self.spans = []
+        self._stack = []
+        self.root = self.open(name, detail)
+
+    def open(self, name, detail="", start_time=None):
+        parent_id = self._stack[-1].span_id if self._stack else 0
+        span = Span(len(self.spans) + 1, parent_id, name, detail, start_time or time.time())
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def close(self, span, end_time=None):
+        span.end_time = end_time or time.time()
+        if span in self._stack:
+            self._stack.remove(span)
+        if self._stack:
+            self._stack[-1].children_time += span.duration
+
+    def add(self, name, start_time, end_time, detail=""):
+        self.close(self.open(name, detail, start_time), end_time)
+
+
+def current_trace():
+    """ Trace of the request executed by the current thread, None if it is not traced """
+
+    return getattr(_context, "trace", None)
+
+
+def current_trace_id():
+    trace = current_trace()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def span(name, detail=""):
+    """ Time code block as a child of the current span, nothing is done if the request is not traced """
+
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+
+    trace_span = trace.open(name, detail)
+    try:
+        yield
+    finally:
+        trace.close(trace_span)
+
+
+def open_span(name, detail=""):
+    """ Start span ending inside of a code block, e.g. a context manager entry, closed by close_span
+    :return: span handle, None if the request is not traced
+    """
+
+    trace = current_trace()
+    return (trace, trace.open(name, detail)) if trace is not None else None
+
+
+def close_span(handle):
+    """ Close span started by open_span, nothing is done if it is closed already """
+
+    if handle is not None and handle[1].end_time is None:
+        handle[0].close(handle[1])
+
+
+def record_span(name, start_time, end_time=None, detail=""):
+    """ Add already finished span """
+
+    trace = current_trace()
+    if trace is not None:
+        trace.add(name, start_time, end_time or time.time(), detail)
+
+
+def traced(func):
+    """ Decorator timing the function as a span named after it """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def wrap_commands(instance, command_names):
+    """ Replace instance methods with traced ones """
+
+    for command_name in command_names:
+        setattr(instance, command_name, traced(getattr(instance, command_name)))
+
+
+class Tracer(object):
+    """ Start and save request traces
+
+    Span records are written to <LOG_PATH>/<driver>/traces/<date>-<pid>.log, one tab separated line per span:
+        trace ID, span ID, parent span ID, start time ms, duration us, self time us, name, detail
+    Self time is the span duration excluding child spans, e.g. output parsing time of an action
+    """
+
+    MIN_DURATION_MS = 0
+
+    def __init__(self, logger, runtime_config, driver_name="telebyte", log_path=None):
+        """
+        :type logger: logging.Logger
+        :type runtime_config: cloudshell.layer_one.core.helper.runtime_configuration.RuntimeConfiguration
+        :param driver_name: logs sub folder
+        :param log_path: logs folder, LOG_PATH environment variable by default
+        """
+
+        self._logger = logger
+        self.enabled = bool(runtime_config.read_key("TRACING.ENABLED", False))
+        self._min_duration = float(runtime_config.read_key("TRACING.MIN_DURATION_MS", self.MIN_DURATION_MS)) / 1000
+        self._driver_name = driver_name
+        self._log_path = log_path
+        self._lock = Lock()
+
+    @staticmethod
+    def new_trace_id():
+        return "{:016x}".format(random.getrandbits(64))
+
+    def begin(self, name, trace_id=None, detail=""):
+        """ Start tracing the current thread request, nothing is done if it is already traced
+        :return: True if the trace was started
+        """
+
+        if not self.enabled or current_trace() is not None:
+            return False
+        _context.trace = Trace(trace_id or self.new_trace_id(), name, detail)
+        return True
+
+    def end(self):
+        """ Finish the current thread trace and save it """
+
+        trace = current_trace()
+        if trace is None:
+            return
+        _context.trace = None
+        trace.close(trace.root)
+
+        if trace.root.duration >= self._min_duration:
+            try:
+                self._save(trace)
+            except Exception:
+                self._logger.exception("Failed to save trace {}".format(trace.trace_id))
+
+    @contextmanager
+    def trace(self, name, trace_id=None, detail=""):
+        """ Trace code block, spans are added to the already started trace if there is one """
+
+        if not self.begin(name, trace_id, detail):
+            with span(name, detail):
+                yield
+            return
+
+        try:
+            yield
+        finally:
+            self.end()
+
+    def _save(self, trace):
+        lines = []
+        for trace_span in trace.spans:
+            if trace_span.end_time is None:
+                continue
+            lines.append("{}\t{}\t{}\t{}\t{}\t{}\t{}\t{}\n".format(
+                trace.trace_id, trace_span.span_id, trace_span.parent_id, int(trace_span.start_time * 1000),
+                int(trace_span.duration * 1000000), int((trace_span.duration - trace_span.children_time) * 1000000),
+                trace_span.name, trace_span.detail.replace("\t", " ").replace("\n", " ")))
+
+        traces_path = os.path.join(self._log_path or os.environ.get("LOG_PATH", "."), self._driver_name, "traces")
+        file_path = os.path.join(traces_path, "{}-{}.log".format(time.strftime("%Y%m%d"), os.getpid()))
+        with self._lock:
+            if not os.path.isdir(traces_path):
+                os.makedirs(traces_path)
+            with open(file_path, "a") as traces_file:
+                traces_file.write("".join(lines))
+
+
+class TracingXMLLogger(object):
+    """ XML logger wrapper starting a trace when request XML is received and saving it when response is sent
+
+    Driver listener logs request before parsing it and response right after sending it, so the trace covers
+    the whole request handling done by the connection thread
+    """
+
+    def __init__(self, xml_logger, tracer):
+        """
+        :type xml_logger: cloudshell.layer_one.core.helper.xml_logger.XMLLogger
+        :type tracer: Tracer
+        """
+
+        self._xml_logger = xml_logger
+        self._tracer = tracer
+
+    def info(self, data):
+        if "<Commands" in data:
+            self._tracer.end()
+            self._tracer.begin("request")
+            _context.received_time = time.time()
+            self._xml_logger.info(data)
+        else:
+            executed_time, _context.executed_time = getattr(_context, "executed_time", None), None
+            record_span("response_build", executed_time or time.time())
+            self._xml_logger.info(data)
+            self._tracer.end()
+
+
+class TracingCommandExecutor(object):
+    """ Command executor wrapper timing request XML parsing and commands execution """
+
+    def __init__(self, command_executor, tracer):
+        """
+        :type command_executor: cloudshell.layer_one.core.command_executor.CommandExecutor
+        :type tracer: Tracer
+        """
+
+        self._command_executor = command_executor
+        self._tracer = tracer
+
+    def execute_commands(self, command_requests):
+        received_time, _context.received_time = getattr(_context, "received_time", None), None
+        if received_time:
+            record_span("xml_parse", received_time)
+
+        command_names = ",".join(command_request.command_name for command_request in command_requests)
+        try:
+            with self._tracer.trace("execute", detail=command_names):
+                return self._command_executor.execute_commands(command_requests)
+        finally:
+            _context.executed_time = time.time()
@@ -0,0 +1,13 @@
+from mock import Mock
+
+
+def runtime_config(values=None, **kwargs):
+    """ RuntimeConfiguration mock returning the given values and the default value for the missing keys
+    :param values: dict read on every call, tests may change it after the mock is created
+    :param kwargs: more values, keys with a dot are passed as **{"SECTION.KEY": value}
+    """
+    config = {} if values is None else values
+    config.update(kwargs)
+    instance = Mock()
+    instance.read_key.side_effect = lambda key, default_value=None: config.get(key, default_value)
+    return instance
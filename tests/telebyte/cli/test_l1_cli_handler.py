@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.layer_one.core.layer_one_driver_exception import LayerOneDriverException
+
+from telebyte.cli.l1_cli_handler import L1CliHandler
+from telebyte.cli.simulator_session import SimulatorSession
+from telebyte.cli.telebyte_cli_handler import TelebyteCliHandler
+from telebyte.helpers.tracing import Tracer
+from tests import runtime_config
+
+
+class TestL1CliHandler(TestCase):
+    def _handler(self, config):
+        handler = L1CliHandler(Mock(), runtime_config(config))
+        handler.define_session_attributes("192.168.42.240", "user", "password")
+        return handler
+
+    def test_new_sessions_configured_types_only(self):
+        handler = self._handler({"CLI.TYPE": ["SIMULATOR"], "CLI.SIMULATOR.SLOTS": ["600-SM-16-1-2"]})
+
+        sessions = handler._new_sessions()
+
+        self.assertEqual(len(sessions), 1)
+        self.assertIsInstance(sessions[0], SimulatorSession)
+        self.assertEqual(sessions[0]._latency, SimulatorSession.LATENCY)
+        self.assertEqual(list(handler._session_classes), ["SIMULATOR"])
+
+    def test_new_sessions_unknown_type(self):
+        handler = self._handler({"CLI.TYPE": ["SERIAL"]})
+        self.assertRaises(LayerOneDriverException, handler._new_sessions)
+
+    def test_session_connect_nested_in_acquire(self):
+        log_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_path)
+        config = runtime_config(**{"CLI.TYPE": ["SIMULATOR"], "CLI.SIMULATOR.LATENCY": 0.01, "TRACING.ENABLED": True})
+        handler = TelebyteCliHandler(Mock(), config)
+        handler.define_session_attributes("192.168.42.240", "user", "password")
+        tracer = Tracer(Mock(), config, log_path=log_path)
+
+        with tracer.trace("login"):
+            with handler.default_mode_service() as session:
+                session.send_command("show sys-id")
+
+        traces_path = os.path.join(log_path, "telebyte", "traces")
+        with open(os.path.join(traces_path, os.listdir(traces_path)[0])) as traces_file:
+            spans = [line.rstrip("\n").split("\t") for line in traces_file]
+        span_ids = {record[6]: record[1] for record in spans}
+        self.assertEqual(dict((record[6], record[2]) for record in spans)["session_connect"],
+                         span_ids["session_acquire"])
+        self.assertTrue(all(int(record[5]) >= 0 for record in spans), spans)
@@ -0,0 +1,71 @@
+import time
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.cli.session_manager_impl import SessionManagerException
+
+from telebyte.cli.racing_session_manager import RacingSessionManager, TransportCache
+
+
+class TestRacingSessionManager(TestCase):
+    def setUp(self):
+        self._logger = Mock()
+        self._transport_cache = TransportCache()
+        self._instance = RacingSessionManager(self._transport_cache)
+
+    def _session(self, session_type, port, delay=0, error=None):
+        session = Mock(session_type=session_type, host="192.168.42.240", port=port)
+
+        def connect(prompt, logger):
+            time.sleep(delay)
+            if error:
+                raise error
+
+        session.connect.side_effect = connect
+        return session
+
+    def test_first_connected_session_wins(self):
+        ssh = self._session("SSH", 22, delay=0.5)
+        telnet = self._session("TELNET", 23)
+
+        start_time = time.time()
+        session = self._instance.new_session([ssh, telnet], "#", self._logger)
+
+        self.assertIs(session, telnet)
+        self.assertLess(time.time() - start_time, 0.4)
+        self.assertEqual(self._transport_cache.get("192.168.42.240"), ("TELNET", 23))
+        self.assertEqual(self._instance.existing_sessions_count(), 1)
+
+        time.sleep(0.7)
+        ssh.disconnect.assert_called_once_with()
+        telnet.disconnect.assert_not_called()
+
+    def test_failed_session_skipped(self):
+        ssh = self._session("SSH", 22, error=Exception("Connection refused"))
+        telnet = self._session("TELNET", 23, delay=0.1)
+
+        self.assertIs(self._instance.new_session([ssh, telnet], "#", self._logger), telnet)
+
+    def test_all_sessions_failed(self):
+        ssh = self._session("SSH", 22, error=Exception("Connection refused"))
+        telnet = self._session("TELNET", 23, error=Exception("Connection refused"))
+
+        self.assertRaises(SessionManagerException, self._instance.new_session, [ssh, telnet], "#", self._logger)
+        self.assertIsNone(self._transport_cache.get("192.168.42.240"))
+
+    def test_remembered_transport_used(self):
+        self._transport_cache.remember("192.168.42.240", "TELNET", 23)
+        ssh = self._session("SSH", 22)
+        telnet = self._session("TELNET", 23)
+
+        self.assertIs(self._instance.new_session([ssh, telnet], "#", self._logger), telnet)
+        ssh.connect.assert_not_called()
+
+    def test_remembered_transport_failed(self):
+        self._transport_cache.remember("192.168.42.240", "TELNET", 23)
+        ssh = self._session("SSH", 22)
+        telnet = self._session("TELNET", 23, error=Exception("Connection refused"))
+
+        self.assertIs(self._instance.new_session([ssh, telnet], "#", self._logger), ssh)
+        self.assertEqual(self._transport_cache.get("192.168.42.240"), ("SSH", 22))
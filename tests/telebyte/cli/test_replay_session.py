@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.cli.replay_session import ReplaySession, ReplaySessionException
+from telebyte.cli.session_recorder import REDACTED, SEND, recording_session_class
+from telebyte.cli.telebyte_command_modes import DefaultCommandMode
+
+
+class FakeSession(object):
+    session_type = "FAKE"
+
+    def __init__(self, host, answers):
+        self.host = host
+        self._answers = list(answers)
+
+    def _initialize_session(self, prompt, logger):
+        pass
+
+    def _send(self, command, logger):
+        pass
+
+    def _receive(self, timeout, logger):
+        return self._answers.pop(0)
+
+    def disconnect(self):
+        pass
+
+
+class FakeTelnetSession(FakeSession):
+    session_type = "FAKE_TELNET"
+
+    def connect(self, prompt, logger):
+        self._initialize_session(prompt, logger)
+        self._receive(1, logger)
+        self._send("admin\r", logger)
+        self._receive(1, logger)
+        self._send("secret\r", logger)
+        self._receive(1, logger)
+
+
+class TestReplaySession(TestCase):
+    def setUp(self):
+        self._capture_folder = tempfile.mkdtemp()
+        self._logger = Mock()
+
+    def tearDown(self):
+        shutil.rmtree(self._capture_folder)
+
+    def _record(self):
+        session_class = recording_session_class(FakeSession, self._capture_folder)
+        session = session_class("192.168.42.240", ["600-6SL:~$ ", "\nACCEPTED SUCCESSFULLY\n\nSystem P/N: 600-6SL\n",
+                                                   "600-6SL:~$ "])
+        session._initialize_session(DefaultCommandMode.PROMPT, self._logger)
+        session._receive(1, self._logger)
+        session._send("show sys-id\r", self._logger)
+        session._receive(1, self._logger)
+        session._receive(1, self._logger)
+        session.disconnect()
+
+        capture_files = os.listdir(self._capture_folder)
+        self.assertEqual(len(capture_files), 1)
+        return os.path.join(self._capture_folder, capture_files[0])
+
+    def _record_telnet(self):
+        session_class = recording_session_class(FakeTelnetSession, self._capture_folder)
+        session = session_class("192.168.42.240", ["Login: ", "Password: ", "600-6SL:~$ ",
+                                                   "\nACCEPTED SUCCESSFULLY\n\nSystem P/N: 600-6SL\n",
+                                                   "600-6SL:~$ "])
+        session.connect(DefaultCommandMode.PROMPT, self._logger)
+        session._send("show sys-id\r", self._logger)
+        session._receive(1, self._logger)
+        session._receive(1, self._logger)
+        session.disconnect()
+
+        return os.path.join(self._capture_folder, os.listdir(self._capture_folder)[0])
+
+    def test_recording_class_is_cached(self):
+        self.assertIs(recording_session_class(FakeSession, self._capture_folder),
+                      recording_session_class(FakeSession, self._capture_folder))
+
+    def test_replay(self):
+        capture_file = self._record()
+        session = ReplaySession("192.168.42.240", "user", "password", capture_file=capture_file,
+                                timing=ReplaySession.TIMING_NONE)
+
+        session.connect(DefaultCommandMode.PROMPT, self._logger)
+        output = session.hardware_expect("show sys-id", DefaultCommandMode.PROMPT, self._logger)
+
+        self.assertIn("System P/N: 600-6SL", output)
+
+    def test_replay_unknown_command(self):
+        capture_file = self._record()
+        session = ReplaySession("192.168.42.240", "user", "password", capture_file=capture_file,
+                                timing=ReplaySession.TIMING_NONE)
+
+        session.connect(DefaultCommandMode.PROMPT, self._logger)
+        self.assertRaises(ReplaySessionException, session.hardware_expect, "show con 1 all",
+                          DefaultCommandMode.PROMPT, self._logger)
+
+    def test_login_redacted(self):
+        capture_file = self._record_telnet()
+
+        sends = [data for _, direction, data in ReplaySession.load_capture(capture_file) if direction == SEND]
+        self.assertEqual(sends, [REDACTED, REDACTED, "show sys-id\r"])
+
+    def test_replay_telnet_login(self):
+        capture_file = self._record_telnet()
+        session = ReplaySession("192.168.42.240", "user", "password", capture_file=capture_file,
+                                timing=ReplaySession.TIMING_NONE)
+
+        session.connect(DefaultCommandMode.PROMPT, self._logger)
+        output = session.hardware_expect("show sys-id", DefaultCommandMode.PROMPT, self._logger)
+
+        self.assertIn("System P/N: 600-6SL", output)
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.cli.simulator_session import SimulatorSession, SimulatedChassis
+from telebyte.cli.telebyte_command_modes import DefaultCommandMode
+
+
+class TestSimulatedChassis(TestCase):
+    def setUp(self):
+        self._chassis = SimulatedChassis(["600-SM-16-1-2", ""])
+
+    def test_slot_info(self):
+        self.assertIn("PN: 600-SM-16-1-2", self._chassis.execute("show slot-id 1"))
+        self.assertEqual(self._chassis.execute("show slot-id 2"), "ERROR  Module Not Found")
+        self.assertEqual(self._chassis.execute("show slot-id 3"), "ERROR  Invalid Slot Number")
+
+    def test_connections(self):
+        self.assertEqual(self._chassis.execute("set con 1 B:1"), "ACCEPTED  set con 1 b:1")
+        self.assertEqual(self._chassis.execute("set con 1 B:3"), "ERROR  Invalid Input Channel")
+        self.assertEqual(self._chassis.execute("set con 1 R:1"), "ERROR  Invalid Output")
+        self.assertIn("B:1;", self._chassis.execute("show con 1 all"))
+
+        self.assertEqual(self._chassis.execute("set term 1 b"), "ACCEPTED  set term 1 b")
+        self.assertIn("B:0;", self._chassis.execute("show con 1 all"))
+
+    def test_high_density_connections(self):
+        chassis = SimulatedChassis(["600-SM-64-1-8"])
+        self.assertEqual(chassis.execute("set con 1 AB:8"), "ACCEPTED  set con 1 ab:8")
+        self.assertEqual(chassis.execute("set con 1 BM:1"), "ERROR  Invalid Output")
+
+        output = chassis.execute("show con 1 all")
+        self.assertIn("AB:8;", output)
+        self.assertIn("BL:0;", output)
+
+
+class TestSimulatorSession(TestCase):
+    def test_send_command(self):
+        logger = Mock()
+        session = SimulatorSession("simulator-test", "user", "password", latency=0)
+
+        session.connect(DefaultCommandMode.PROMPT, logger)
+        output = session.hardware_expect("show sys-id", DefaultCommandMode.PROMPT, logger)
+
+        self.assertIn("System P/N: 600-6SL", output)
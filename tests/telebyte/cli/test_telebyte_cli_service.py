@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from mock import Mock
+
+from cloudshell.cli.cli_service_impl import CliServiceImpl
+
+from telebyte.cli.simulator_session import SimulatorSession
+from telebyte.cli.telebyte_cli_service import TelebyteCliService
+from telebyte.cli.telebyte_command_modes import DefaultCommandMode
+from telebyte.command_actions.mapping_actions import MappingActions
+
+
+class TestTelebyteCliService(TestCase):
+    def setUp(self):
+        self._cli_service = Mock()
+        self._latency_tracker = Mock()
+        self._latency_tracker.get_timeout.return_value = 5
+        self._rate_limiter = Mock()
+        self._instance = TelebyteCliService(self._cli_service, "192.168.42.240", self._latency_tracker,
+                                            self._rate_limiter, Mock())
+
+    def test_send_command_adaptive_timeout(self):
+        self._instance.send_command("show con 1 all", command_template="show con {slot_id} all")
+
+        self._latency_tracker.get_timeout.assert_called_once_with("192.168.42.240", "show con {slot_id} all")
+        self._rate_limiter.acquire_command.assert_called_once_with("192.168.42.240")
+        self._cli_service.send_command.assert_called_once_with("show con 1 all", action_map=None, error_map=None,
+                                                               timeout=5)
+        self.assertEqual(self._latency_tracker.record.call_args[0][:2], ("192.168.42.240", "show con {slot_id} all"))
+
+    def test_send_command_records_failures(self):
+        self._cli_service.send_command.side_effect = Exception("Socket closed by timeout")
+
+        self.assertRaises(Exception, self._instance.send_command, "show sys-id", timeout=10)
+        self._latency_tracker.get_timeout.assert_not_called()
+        self.assertEqual(self._latency_tracker.record.call_args[0][:2], ("192.168.42.240", "show sys-id"))
+
+    def test_send_commands_one_round_trip(self):
+        session = SimulatorSession("simulator-batch", "user", "password", latency=0.05)
+        session.connect(DefaultCommandMode.PROMPT, Mock())
+        cli_service = CliServiceImpl(session, DefaultCommandMode(), Mock())
+        instance = TelebyteCliService(cli_service, "simulator-batch", self._latency_tracker, self._rate_limiter,
+                                      Mock())
+
+        answers = MappingActions(instance, Mock()).map_batch(1, [("A", 1), ("B", 3), ("B", 2), ("A", 0)])
+
+        self.assertEqual(answers, ["ACCEPTED  set con 1 a:1", "ERROR  Invalid Input Channel",
+                                   "ACCEPTED  set con 1 b:2", "ACCEPTED  set term 1 a"])
+        self.assertEqual(self._rate_limiter.acquire_command.call_count, 4)
+        self.assertEqual(self._latency_tracker.record.call_count, 1)
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from telebyte.helpers.connection_snapshot import ConnectionSnapshot
+
+
+class TestConnectionSnapshot(TestCase):
+    def test_dumps_loads(self):
+        snapshot = ConnectionSnapshot("192.168.42.240", {3: {}, 1: {"AA": 2, "b": 1, "C": 0, "A": "1"}})
+
+        data = snapshot.dumps()
+        self.assertEqual(data.splitlines()[1:], ["1 A:1;B:1;AA:2;", "3"])
+
+        loaded = ConnectionSnapshot.loads(data)
+        self.assertEqual(loaded.address, "192.168.42.240")
+        self.assertEqual(loaded.slots, snapshot.slots)
+        self.assertEqual(int(loaded.created), int(snapshot.created))
+
+    def test_loads_not_snapshot(self):
+        self.assertRaises(ValueError, ConnectionSnapshot.loads, "1 A:1;")
+        self.assertRaises(ValueError, ConnectionSnapshot.loads, "# telebyte connections 10.0.0.1\nslot A:1;")
+
+    def test_changes(self):
+        connections = ConnectionSnapshot("192.168.42.240", {1: {"A": 1, "C": 2, "AB": 1}}).slots[1]
+
+        changes = ConnectionSnapshot.changes(connections, {"A": 1, "B": 2, "C": 1, "AB": 0})
+
+        self.assertEqual(changes, [("B", 0), ("C", 2), ("AB", 1)])
+        self.assertEqual(ConnectionSnapshot.changes(connections, {"A": 1, "C": 2, "AB": 1}), [])
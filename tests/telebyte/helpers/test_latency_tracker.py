@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from telebyte.helpers.latency_tracker import LatencyTracker
+from tests import runtime_config
+
+
+class TestLatencyTracker(TestCase):
+    def setUp(self):
+        self._instance = LatencyTracker(runtime_config(**{"TIMEOUTS.MIN": 1, "TIMEOUTS.MAX": 30}))
+
+    def test_timeout_without_history(self):
+        self.assertEqual(self._instance.get_timeout("192.168.42.240", "show con {slot_id} all"), 30)
+
+    def test_timeout_follows_latency(self):
+        for _ in range(20):
+            self._instance.record("192.168.42.240", "show con {slot_id} all", 2.0)
+
+        self.assertAlmostEqual(self._instance.get_average("192.168.42.240", "show con {slot_id} all"), 2.0)
+        self.assertGreater(self._instance.get_timeout("192.168.42.240", "show con {slot_id} all"), 2.0)
+        self.assertLess(self._instance.get_timeout("192.168.42.240", "show con {slot_id} all"), 3.0)
+
+    def test_timeout_limits_and_chassis_fallback(self):
+        self._instance.record("192.168.42.240", "show con {slot_id} all", 0.01)
+        self._instance.record("192.168.42.241", "show con {slot_id} all", 100)
+
+        self.assertEqual(self._instance.get_timeout("192.168.42.240", "set con {slot_id} {connection}"), 1)
+        self.assertEqual(self._instance.get_timeout("192.168.42.241", "show con {slot_id} all"), 30)
@@ -0,0 +1,150 @@
+import os
+import shutil
+import tempfile
+from threading import Thread
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.helpers.mapping_journal import JournalRecord, MappingJournal
+from tests import runtime_config
+
+
+class TestMappingJournal(TestCase):
+    def setUp(self):
+        self._address = "192.168.42.240"
+        self._log_path = tempfile.mkdtemp()
+        self._config = {"JOURNAL.ENABLED": True}
+        self._instance = self._journal()
+
+    def tearDown(self):
+        self._instance.close()
+        shutil.rmtree(self._log_path)
+
+    def _journal(self):
+        return MappingJournal(Mock(), runtime_config(self._config), log_path=self._log_path)
+
+    def _reload(self):
+        self._instance.close()
+        self._instance = self._journal()
+
+    def test_disabled(self):
+        self._config = {}
+        instance = self._journal()
+
+        self.assertIsNone(instance.record(self._address, 1, "A", 1))
+        self.assertEqual(instance.get_connections(self._address), {})
+        self.assertEqual(instance.changes_since(self._address, 0), [])
+        self.assertFalse(os.path.exists(os.path.join(self._log_path, "telebyte", "journal")))
+
+    def test_record_and_recover(self):
+        self.assertEqual(self._instance.record(self._address, 1, "a", 1), 1)
+        self.assertEqual(self._instance.record(self._address, 1, "AB", 2), 2)
+        self.assertEqual(self._instance.record(self._address, 1, "A", 0), 3)
+        self._instance.record("192.168.42.241", 1, "A", 1)
+
+        self._reload()
+
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"AB": 2}})
+        self.assertEqual(self._instance.last_sequence(self._address), 3)
+        self.assertEqual(self._instance.record(self._address, 2, "B", 1), 4)
+
+    def test_changes_since(self):
+        self._instance.record(self._address, 1, "A", 1)
+        self._instance.record(self._address, 1, "B", 2)
+        self._instance.record(self._address, 1, "A", 0)
+
+        changes = self._instance.changes_since(self._address, 1)
+
+        self.assertEqual([(record.sequence, record.out_port, record.in_port, record.operation) for record in changes],
+                         [(2, "B", 2, "con"), (3, "A", 0, "term")])
+        self.assertEqual(self._instance.changes_since(self._address, 3), [])
+
+    def test_sync_slot(self):
+        self._instance.record(self._address, 1, "A", 1)
+        self._instance.record(self._address, 1, "B", 2)
+
+        self._instance.sync_slot(self._address, 1, {"A": 1, "B": 0, "C": 2})
+
+        changes = self._instance.changes_since(self._address, 2)
+        self.assertEqual([(record.out_port, record.in_port, record.operation) for record in changes],
+                         [("B", 0, "sync"), ("C", 2, "sync")])
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"A": 1, "C": 2}})
+
+    def test_sync_slot_changed_after_read(self):
+        sequence = self._instance.slot_sequence(self._address, 1)
+        self._instance.record(self._address, 1, "A", 2)
+
+        self.assertIsNone(self._instance.sync_slot(self._address, 1, {"A": 1}, sequence))
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"A": 2}})
+
+        sequence = self._instance.slot_sequence(self._address, 1)
+        self._instance.record(self._address, 2, "A", 1)
+        self.assertEqual(self._instance.sync_slot(self._address, 1, {"A": 2, "B": 1}, sequence), [(1, "B", 1)])
+
+    def test_compacted_on_load(self):
+        self._config["JOURNAL.MAX_RECORDS"] = 3
+        self._reload()
+        for in_port in (1, 2, 1, 2):
+            self._instance.record(self._address, 1, "A", in_port)
+        self._instance.record(self._address, 1, "B", 1)
+
+        self._reload()
+
+        changes = self._instance.changes_since(self._address, 0)
+        self.assertEqual([(record.sequence, record.out_port, record.in_port) for record in changes],
+                         [(4, "A", 2), (5, "B", 1)])
+        self.assertEqual(self._instance.record(self._address, 1, "C", 1), 6)
+
+    def test_compacted_at_run_time(self):
+        self._config["JOURNAL.MAX_RECORDS"] = 2
+        self._reload()
+        for in_port in (1, 2, 1, 2, 1):
+            self._instance.record(self._address, 1, "A", in_port)
+        self._instance.record(self._address, 1, "B", 1)
+
+        with open(os.path.join(self._log_path, "telebyte", "journal", self._address + ".journal")) as journal:
+            lines = journal.read().splitlines()
+        self.assertEqual([line.split("\t")[0] for line in lines], ["5", "6"])
+        self.assertEqual(self._instance.record(self._address, 1, "C", 1), 7)
+
+        self._reload()
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"A": 1, "B": 1, "C": 1}})
+        self.assertEqual(self._instance.last_sequence(self._address), 7)
+
+    def test_incomplete_line_removed(self):
+        self._instance.record(self._address, 1, "A", 1)
+        self._instance.close()
+        with open(os.path.join(self._log_path, "telebyte", "journal", self._address + ".journal"), "a") as journal:
+            journal.write("2\t1700000000.000\t1\tB")
+
+        self._instance = self._journal()
+
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"A": 1}})
+        self.assertEqual(self._instance.last_sequence(self._address), 1)
+
+        self.assertEqual(self._instance.record(self._address, 1, "C", 2), 2)
+        self._reload()
+
+        self.assertEqual(self._instance.get_connections(self._address), {1: {"A": 1, "C": 2}})
+        self.assertEqual(self._instance.record(self._address, 1, "D", 1), 3)
+
+    def test_concurrent_records(self):
+        def record(slot_id):
+            for port in ("A", "B", "C", "D", "E"):
+                self._instance.record(self._address, slot_id, port, 1)
+
+        threads = [Thread(target=record, args=(slot_id,)) for slot_id in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self._reload()
+        sequences = [record.sequence for record in self._instance.changes_since(self._address, 0)]
+        self.assertEqual(sequences, list(range(1, 21)))
+
+    def test_record_line(self):
+        record = JournalRecord(7, 1700000000.5, 2, "AB", 0, "term")
+        self.assertEqual(record.dumps(), "7\t1700000000.500\t2\tAB\t0\tterm\n")
+        self.assertEqual(JournalRecord.loads(record.dumps()), record)
@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.helpers.optical_sampler import OpticalSampler
+from telebyte.helpers.ring_buffer import SampleRingBuffer
+from tests import runtime_config
+
+
+class TestSampleRingBuffer(TestCase):
+    def test_overwrites_oldest(self):
+        buffer = SampleRingBuffer(3, ("rx_power",))
+        for i in range(5):
+            buffer.append({"rx_power": float(i)}, timestamp=100 + i)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.samples(), [(102, 2.0), (103, 3.0), (104, 4.0)])
+        self.assertEqual(buffer.samples(last=1), [(104, 4.0)])
+        self.assertEqual(buffer.latest(), {"time": 104, "rx_power": 4.0})
+
+    def test_stats_window(self):
+        buffer = SampleRingBuffer(10, ("rx_power",))
+        now = time.time()
+        buffer.append({"rx_power": -10.0}, timestamp=now - 100)
+        buffer.append({"rx_power": -3.0}, timestamp=now - 2)
+        buffer.append({"rx_power": -1.0}, timestamp=now - 1)
+
+        self.assertEqual(buffer.stats("rx_power"), (-10.0, -1.0, -14.0 / 3))
+        self.assertEqual(buffer.stats("rx_power", window=10), (-3.0, -1.0, -2.0))
+        self.assertIsNone(SampleRingBuffer(10, ("rx_power",)).stats("rx_power"))
+
+
+class TestOpticalSampler(TestCase):
+    def setUp(self):
+        self._log_path = tempfile.mkdtemp()
+        self._instance = OpticalSampler(Mock(), runtime_config(), log_path=self._log_path)
+
+    def tearDown(self):
+        shutil.rmtree(self._log_path)
+
+    def test_sample_slots(self):
+        self._instance.read_slot = Mock(return_value={"A": (-3.25, -1.5, 1310.0), "1": (-2.5, -1.0, 1310.0)})
+
+        self._instance.sample("192.168.42.240", Mock(), [1])
+
+        self.assertEqual(self._instance.latest("192.168.42.240", 1, "a")["rx_power"], -3.25)
+        self.assertEqual(self._instance.stats("192.168.42.240", 1, 1, "tx_power"), (-1.0, -1.0, -1.0))
+        self.assertIsNone(self._instance.latest("192.168.42.240", 1, "B"))
+
+    def test_not_supported(self):
+        config = runtime_config(**{"SAMPLER.ENABLED": True})
+
+        self.assertFalse(OpticalSampler(Mock(), config, log_path=self._log_path).enabled)
+        self.assertRaises(NotImplementedError, self._instance.read_slot, Mock(), 1)
+
+    def test_flush_appends_new_samples(self):
+        self._instance.add_samples("192.168.42.240", 1, {"A": (-3.25, -1.5, 1310.0)}, timestamp=100)
+        self._instance.flush()
+        self._instance.add_samples("192.168.42.240", 1, {"A": (-3.5, -1.5, 1310.0)}, timestamp=160)
+        self._instance.flush()
+        self._instance.flush()
+
+        file_path = "{}/telebyte/optics/192.168.42.240-{}.bin".format(self._log_path, time.strftime("%Y%m%d"))
+        self.assertEqual(OpticalSampler.read_records(file_path), [(100, 1, "A", -3.25, -1.5, 1310.0),
+                                                                  (160, 1, "A", -3.5, -1.5, 1310.0)])
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from telebyte.exceptions.telebyte_exceptions import InvalidPortException
+from telebyte.helpers.port_index import PortIndex, PortRecord
+
+
+class TestPortIndex(TestCase):
+    def setUp(self):
+        self._address = "192.168.42.240"
+        self._instance = PortIndex()
+        self._records = self._instance.add_slot(self._address, 1, 16, 2)
+        self._instance.mark_indexed(self._address)
+
+    def test_add_slot(self):
+        self.assertEqual(len(self._records), 18)
+        self.assertEqual(self._records[0], PortRecord(1, "A", None))
+        self.assertEqual(self._records[15], PortRecord(1, "P", None))
+        self.assertEqual(self._records[16], PortRecord(1, None, 1))
+        self.assertTrue(self._instance.is_indexed(self._address))
+
+    def test_resolve_normalizes_port(self):
+        record = self._instance.resolve("192.168.42.240/1/b")
+        self.assertEqual(record, PortRecord(1, "B", None))
+        self.assertTrue(record.is_output)
+        self.assertEqual(record.port_id, "B")
+
+        record = self._instance.resolve("192.168.42.240/01/02")
+        self.assertEqual(record, PortRecord(1, None, 2))
+        self.assertFalse(record.is_output)
+        self.assertEqual(record.port_id, 2)
+
+    def test_resolve_unknown_port(self):
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/1/3")
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/1/Q")
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/2/A")
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/A")
+
+    def test_clear(self):
+        self._instance.clear(self._address)
+        self.assertFalse(self._instance.is_indexed(self._address))
+        self.assertIsNone(self._instance.get(self._address, 1, "A"))
+
+    def test_indexed_after_mark_only(self):
+        index = PortIndex()
+        index.add_slot(self._address, 1, 16, 2)
+        self.assertFalse(index.is_indexed(self._address))
+        index.mark_indexed(self._address)
+        self.assertTrue(index.is_indexed(self._address))
+
+    def test_retain_slots(self):
+        self._instance.add_slot(self._address, 2, 4, 4)
+        self._instance.add_slot(self._address, 1, 4, 2)
+        self._instance.retain_slots(self._address, [1])
+
+        self.assertEqual(self._instance.get_slot_ids(self._address), [1])
+        self.assertIsNone(self._instance.get(self._address, 1, "E"))
+        self.assertIsNotNone(self._instance.get(self._address, 1, "D"))
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/2/A")
+
+    def test_out_port_names(self):
+        for number, name in [(1, "A"), (26, "Z"), (27, "AA"), (52, "AZ"), (53, "BA"), (702, "ZZ"), (703, "AAA")]:
+            self.assertEqual(PortIndex.out_port_name(number), name)
+            self.assertEqual(PortIndex.out_port_number(name), number)
+        self.assertEqual(PortIndex.out_port_number("A1"), 0)
+
+    def test_high_density_slot(self):
+        records = self._instance.add_slot(self._address, 2, 64, 8)
+        self.assertEqual(records[26], PortRecord(2, "AA", None))
+        self.assertEqual(records[63], PortRecord(2, "BL", None))
+        self.assertEqual(records[64], PortRecord(2, None, 1))
+
+        self.assertEqual(self._instance.resolve("192.168.42.240/2/ab"), PortRecord(2, "AB", None))
+        self.assertEqual(self._instance.get(self._address, 2, "BL"), PortRecord(2, "BL", None))
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/2/BM")
+        self.assertRaises(InvalidPortException, self._instance.resolve, "192.168.42.240/1/AA")
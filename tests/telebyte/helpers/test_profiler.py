@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.helpers.profiler import CommandProfiler
+from tests import runtime_config
+
+
+class TestCommandProfiler(TestCase):
+    def setUp(self):
+        self._log_path = tempfile.mkdtemp()
+        self._config = {"PROFILING.ENABLED": True, "PROFILING.MAX_FILES": 2}
+        self._runtime_config = runtime_config(self._config)
+
+    def tearDown(self):
+        shutil.rmtree(self._log_path)
+
+    def _profiles(self):
+        return os.listdir(os.path.join(self._log_path, "telebyte", "profiles"))
+
+    def test_wrap_commands(self):
+        commands = Mock()
+        commands.login.__name__ = "login"
+        commands.login.return_value = "result"
+        profiler = CommandProfiler(Mock(), self._runtime_config, log_path=self._log_path)
+
+        profiler.wrap_commands(commands, ["login"])
+
+        self.assertEqual(commands.login("address"), "result")
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertIn("--login--", profiles[0])
+
+    def test_disabled(self):
+        self._config["PROFILING.ENABLED"] = False
+        commands = Mock()
+        login = commands.login
+        profiler = CommandProfiler(Mock(), self._runtime_config, log_path=self._log_path)
+
+        profiler.wrap_commands(commands, ["login"])
+
+        self.assertIs(commands.login, login)
+
+    def test_max_files(self):
+        profiler = CommandProfiler(Mock(), self._runtime_config, log_path=self._log_path)
+        for command_name in ["login", "map_bidi", "map_clear"]:
+            with profiler.profile(command_name):
+                pass
+
+        self.assertEqual(len(self._profiles()), 2)
@@ -0,0 +1,85 @@
+import time
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.command_actions.autoload_actions import AutoloadActions
+from telebyte.command_actions.mapping_actions import MappingActions
+from telebyte.helpers.query_memo import QueryMemo
+from tests import runtime_config
+
+
+class TestQueryMemo(TestCase):
+    def setUp(self):
+        self._config = {}
+        self._instance = self._memo()
+
+    def _memo(self):
+        return QueryMemo(runtime_config(self._config))
+
+    def test_result_reused(self):
+        query = Mock(return_value={"A": 1})
+
+        self.assertEqual(self._instance.get("192.168.42.240", "get_slot_connections", 1, query), {"A": 1})
+        result = self._instance.get("192.168.42.240", "get_slot_connections", 1, query)
+        result["B"] = 2
+
+        self.assertEqual(self._instance.get("192.168.42.240", "get_slot_connections", 1, query), {"A": 1})
+        self._instance.get("192.168.42.240", "get_slot_connections", 2, query)
+        self._instance.get("192.168.42.241", "get_slot_connections", 1, query)
+        self.assertEqual(query.call_count, 3)
+
+    def test_expired(self):
+        self._config["MEMO.TTL"] = 0.05
+        instance = self._memo()
+        query = Mock(return_value="600-6SL")
+
+        instance.get("192.168.42.240", "get_device_info", None, query)
+        time.sleep(0.1)
+        instance.get("192.168.42.240", "get_device_info", None, query)
+
+        self.assertEqual(query.call_count, 2)
+
+    def test_disabled(self):
+        self._config["MEMO.TTL"] = 0
+        instance = self._memo()
+        query = Mock(return_value="600-6SL")
+
+        instance.get("192.168.42.240", "get_device_info", None, query)
+        instance.get("192.168.42.240", "get_device_info", None, query)
+
+        self.assertEqual(query.call_count, 2)
+
+    def test_invalidate_slot(self):
+        query = Mock(return_value={"A": 1})
+        self._instance.get("192.168.42.240", "get_slot_connections", 1, query)
+        self._instance.get("192.168.42.240", "get_slot_connections", 2, query)
+
+        self._instance.invalidate("192.168.42.240", 1)
+        self._instance.get("192.168.42.240", "get_slot_connections", 1, query)
+        self._instance.get("192.168.42.240", "get_slot_connections", 2, query)
+
+        self.assertEqual(query.call_count, 3)
+
+    def test_changed_during_query_not_stored(self):
+        def query():
+            self._instance.invalidate("192.168.42.240", 1)
+            return {"A": 1}
+
+        self._instance.get("192.168.42.240", "get_slot_connections", 1, query)
+        second_query = Mock(return_value={"A": 2})
+
+        self.assertEqual(self._instance.get("192.168.42.240", "get_slot_connections", 1, second_query), {"A": 2})
+
+    def test_actions_share_memo(self):
+        cli_service = Mock(host="192.168.42.240")
+        cli_service.send_command.return_value = "ACCEPTED  show con 1 all\n\nSlot: 1\nA:1;\nB:0;\n"
+
+        AutoloadActions(cli_service, Mock(), self._instance).get_slot_connections(slot_id=1)
+        connections = AutoloadActions(cli_service, Mock(), self._instance).get_slot_connections(1)
+        self.assertEqual(connections, {"A": 1, "B": 0})
+        self.assertEqual(cli_service.send_command.call_count, 1)
+
+        MappingActions(cli_service, Mock(), self._instance).map_clear(slot_id=1, port="A")
+        AutoloadActions(cli_service, Mock(), self._instance).get_slot_connections(slot_id=1)
+        self.assertEqual(cli_service.send_command.call_count, 3)
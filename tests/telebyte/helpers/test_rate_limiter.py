@@ -0,0 +1,69 @@
+import time
+from threading import Thread
+from unittest import TestCase
+
+from telebyte.exceptions.telebyte_exceptions import RateLimitException
+from telebyte.helpers.rate_limiter import RateLimiter, TokenBucket
+from tests import runtime_config
+
+
+class TestTokenBucket(TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(20, 2)
+        start_time = time.time()
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.time() - start_time, 0.09)
+        self.assertLess(time.time() - start_time, 0.5)
+
+    def test_max_wait(self):
+        bucket = TokenBucket(1, 1)
+        bucket.acquire(max_wait=0.1)
+        self.assertRaises(RateLimitException, bucket.acquire, 0.1)
+
+
+class TestRateLimiter(TestCase):
+    def _create_instance(self, **config):
+        return RateLimiter(runtime_config(config))
+
+    def test_no_limits_by_default(self):
+        instance = self._create_instance()
+        start_time = time.time()
+        for _ in range(100):
+            instance.acquire_command("192.168.42.240")
+        with instance.session("192.168.42.240"), instance.session("192.168.42.240"):
+            pass
+        self.assertLess(time.time() - start_time, 0.1)
+
+    def test_commands_rate_per_chassis(self):
+        instance = self._create_instance(**{"RATE_LIMIT.COMMANDS_PER_SECOND": 10, "RATE_LIMIT.BURST": 1})
+        start_time = time.time()
+        instance.acquire_command("192.168.42.240")
+        instance.acquire_command("192.168.42.241")
+        self.assertLess(time.time() - start_time, 0.05)
+        instance.acquire_command("192.168.42.240")
+        self.assertGreaterEqual(time.time() - start_time, 0.09)
+
+    def test_sessions_limit(self):
+        instance = self._create_instance(**{"RATE_LIMIT.SESSIONS": 1, "RATE_LIMIT.MAX_WAIT": 0.05})
+        events = []
+
+        def hold_session():
+            with instance.session("192.168.42.240"):
+                events.append("acquired")
+                time.sleep(0.2)
+
+        thread = Thread(target=hold_session)
+        thread.start()
+        time.sleep(0.05)
+        with instance.session("192.168.42.241"):
+            events.append("other chassis")
+        with self.assertRaises(RateLimitException):
+            with instance.session("192.168.42.240"):
+                pass
+        thread.join()
+
+        with instance.session("192.168.42.240"):
+            events.append("released")
+        self.assertEqual(events, ["acquired", "other chassis", "released"])
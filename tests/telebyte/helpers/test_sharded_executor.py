@@ -0,0 +1,98 @@
+import pickle
+from collections import defaultdict
+from threading import Thread
+from unittest import TestCase
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+from mock import Mock, patch
+
+from cloudshell.layer_one.core.layer_one_driver_exception import LayerOneDriverException
+from cloudshell.layer_one.core.request.command_request import CommandRequest
+
+from telebyte.helpers.sharded_executor import ShardedCommandExecutor
+
+
+def command_request(command_name, **params):
+    command_params = defaultdict(list)
+    for key, value in params.items():
+        command_params[key].append(value)
+    return CommandRequest(command_name, "1", command_params)
+
+
+class FakeWorker(object):
+    """ Worker process stub answering each request with its worker ID and process number, "Crash" exits it """
+
+    started = []
+
+    def __init__(self, target, name, args):
+        self._worker_id, self._request_queue, self._response_queue = args[3:6]
+        self.daemon = False
+        self.exitcode = None
+        self._alive = False
+
+    def start(self):
+        self._alive = True
+        FakeWorker.started.append(self)
+        thread = Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def is_alive(self):
+        return self._alive
+
+    def _run(self):
+        number = len(FakeWorker.started)
+        while True:
+            request_id, _, command_requests = self._request_queue.get()
+            if command_requests[0].command_name == "Crash":
+                self.exitcode = 1
+                self._alive = False
+                return
+            self._response_queue.put((request_id, pickle.dumps([self._worker_id, number]), None))
+
+
+class TestShardedCommandExecutor(TestCase):
+    def _executor(self, workers_count=3):
+        FakeWorker.started = []
+        multiprocessing_patch = patch("telebyte.helpers.sharded_executor.multiprocessing")
+        multiprocessing_mod = multiprocessing_patch.start()
+        self.addCleanup(multiprocessing_patch.stop)
+        multiprocessing_mod.Process.side_effect = FakeWorker
+        multiprocessing_mod.Queue.side_effect = Queue
+        instance = ShardedCommandExecutor("telebyte", "config.yml", "Logs", workers_count, Mock())
+        instance.WORKER_CHECK_INTERVAL = 0.01
+        return instance
+
+    def test_routed_to_chassis_worker(self):
+        instance = self._executor()
+
+        for address in ("192.168.42.240", "192.168.42.241", "192.168.42.242"):
+            worker_id = instance.get_worker_id(address)
+            self.assertEqual(instance.execute_commands([command_request("Login", Address=address)])[0], worker_id)
+            self.assertEqual(instance.execute_commands(
+                [command_request("MapBidi", MapPort_A=address + "/1/A", MapPort_B=address + "/1/1")])[0], worker_id)
+            self.assertEqual(instance.execute_commands([command_request("GetStateId")])[0], worker_id)
+        self.assertEqual(len(FakeWorker.started), 3)
+
+    def test_exited_worker_restarted(self):
+        instance = self._executor()
+        address = "192.168.42.240"
+        worker_id = instance.get_worker_id(address)
+
+        self.assertRaises(LayerOneDriverException, instance.execute_commands,
+                          [command_request("Crash", Address=address)])
+
+        self.assertEqual(instance.execute_commands([command_request("Login", Address=address)]), [worker_id, 4])
+        self.assertEqual(len(FakeWorker.started), 4)
+    def test_get_chassis_address(self):
+        self.assertEqual(ShardedCommandExecutor.get_chassis_address(
+            [command_request("Login", Address="192.168.42.240", User="admin", Password="admin")]),
+            "192.168.42.240")
+        self.assertEqual(ShardedCommandExecutor.get_chassis_address(
+            [command_request("MapBidi", MapPort_A="192.168.42.241/1/A", MapPort_B="192.168.42.241/1/1")]),
+            "192.168.42.241")
+        self.assertIsNone(ShardedCommandExecutor.get_chassis_address([command_request("GetStateId")]))
@@ -0,0 +1,56 @@
+import time
+from threading import Thread
+from unittest import TestCase
+
+from telebyte.helpers.slot_locks import SlotLockManager
+
+
+class TestSlotLockManager(TestCase):
+    def setUp(self):
+        self._instance = SlotLockManager()
+        self._events = []
+
+    def _run(self, name, slots, duration=0.1):
+        with self._instance.lock(slots):
+            self._events.append(("start", name))
+            time.sleep(duration)
+            self._events.append(("end", name))
+
+    def _start(self, name, slots):
+        thread = Thread(target=self._run, args=(name, slots))
+        thread.start()
+        time.sleep(0.02)
+        return thread
+
+    def test_same_slot_ordered(self):
+        threads = [self._start(name, [("192.168.42.240", 1)]) for name in ("first", "second", "third")]
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._events, [("start", "first"), ("end", "first"), ("start", "second"),
+                                        ("end", "second"), ("start", "third"), ("end", "third")])
+
+    def test_different_slots_parallel(self):
+        threads = [self._start("first", [("192.168.42.240", 1)]), self._start("second", [("192.168.42.240", 2)]),
+                   self._start("third", [("192.168.42.241", 1)])]
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([event for event, _ in self._events], ["start", "start", "start", "end", "end", "end"])
+
+    def test_several_slots(self):
+        threads = [self._start("first", [("192.168.42.240", 2), ("192.168.42.240", "1")]),
+                   self._start("second", [("192.168.42.240", 1)])]
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._events, [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")])
+
+    def test_unused_locks_removed(self):
+        threads = [self._start("first", [("192.168.42.240", 1)]), self._start("second", [("192.168.42.240", 1)])]
+        self.assertEqual(list(self._instance._locks), [("192.168.42.240", 1)])
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._instance._locks, {})
+        self.assertEqual(self._instance._users, {})
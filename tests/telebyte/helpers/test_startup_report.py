@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from telebyte.helpers.startup_report import StartupReport
+
+
+class TestStartupReport(TestCase):
+    def test_report(self):
+        instance = StartupReport()
+        with instance.phase("config"):
+            pass
+        with instance.phase("driver_import"):
+            pass
+
+        self.assertEqual([name for name, _ in instance.phases], ["config", "driver_import"])
+        report = instance.report()
+        self.assertTrue(report.startswith("Driver startup took "))
+        self.assertIn("config 0.0", report)
+        self.assertIn("driver_import 0.0", report)
+
+    def test_phase_failed(self):
+        instance = StartupReport()
+
+        def failed_phase():
+            with instance.phase("config"):
+                raise IOError()
+
+        self.assertRaises(IOError, failed_phase)
+        self.assertEqual([name for name, _ in instance.phases], ["config"])
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from mock import Mock
+
+from telebyte.helpers.tracing import Tracer, TracingCommandExecutor, TracingXMLLogger, current_trace_id, span, \
+    traced
+from tests import runtime_config
+
+
+class TestTracer(TestCase):
+    def setUp(self):
+        self._log_path = tempfile.mkdtemp()
+        self._instance = Tracer(Mock(), runtime_config(**{"TRACING.ENABLED": True}), log_path=self._log_path)
+
+    def tearDown(self):
+        shutil.rmtree(self._log_path)
+
+    def _read_spans(self):
+        traces_path = os.path.join(self._log_path, "telebyte", "traces")
+        spans = []
+        for file_name in os.listdir(traces_path):
+            with open(os.path.join(traces_path, file_name)) as traces_file:
+                spans.extend(line.rstrip("\n").split("\t") for line in traces_file)
+        return spans
+
+    def test_trace_spans(self):
+        @traced
+        def get_slot_info():
+            with span("cli", "show slot-id 1"):
+                pass
+
+        with self._instance.trace("request", trace_id="00000000000000ab"):
+            self.assertEqual(current_trace_id(), "00000000000000ab")
+            get_slot_info()
+        self.assertIsNone(current_trace_id())
+
+        spans = self._read_spans()
+        self.assertEqual([(record[0], record[1], record[2], record[6], record[7]) for record in spans],
+                         [("00000000000000ab", "1", "0", "request", ""),
+                          ("00000000000000ab", "2", "1", "get_slot_info", ""),
+                          ("00000000000000ab", "3", "2", "cli", "show slot-id 1")])
+        self.assertLessEqual(int(spans[1][5]), int(spans[1][4]))
+
+    def test_span_without_trace(self):
+        with span("cli"):
+            self.assertIsNone(current_trace_id())
+
+    def test_request_stages(self):
+        command_executor = Mock()
+        command_executor.execute_commands.return_value = []
+        executor = TracingCommandExecutor(command_executor, self._instance)
+        xml_logger = TracingXMLLogger(Mock(), self._instance)
+        command_request = Mock()
+        command_request.command_name = "MapBidi"
+
+        xml_logger.info("<Commands>")
+        executor.execute_commands([command_request])
+        xml_logger.info("<Responses>")
+
+        self.assertEqual([(record[6], record[7]) for record in self._read_spans()],
+                         [("request", ""), ("xml_parse", ""), ("execute", "MapBidi"), ("response_build", "")])
@@ -1,9 +1,15 @@
+import shutil
+import tempfile
 from unittest import TestCase
 
-from mock import Mock
+from mock import Mock, MagicMock, patch
 
 from cloudshell.layer_one.core.driver_commands_interface import DriverCommandsInterface
 from telebyte.driver_commands import DriverCommands
+from telebyte.exceptions.telebyte_exceptions import InvalidConnectionException, InvalidPortException
+from telebyte.helpers.connection_snapshot import ConnectionSnapshot
+from telebyte.helpers.mapping_journal import MappingJournal
+from tests import runtime_config
 
 
 
@@ -11,8 +17,152 @@ from telebyte.driver_commands import DriverCommands
 class TestDriverCommands(TestCase):
     def setUp(self):
         self._logger = Mock()
-        self._runtime_config_instance = Mock()
+        self._runtime_config_instance = runtime_config()
         self._instance = DriverCommands(self._logger, self._runtime_config_instance)
 
     def test_implementing_interface(self):
         self.assertIsInstance(self._instance, DriverCommandsInterface)
+
+    @patch("telebyte.driver_commands.MappingActions")
+    def test_map_bidi_normalizes_ports(self, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+
+        self._instance.map_bidi("192.168.42.240/1/2", "192.168.42.240/1/c")
+
+        mapping_actions_class.return_value.map_bidi.assert_called_once_with(slot_id=1, out_port="C", in_port=2)
+
+    @patch("telebyte.driver_commands.MappingActions")
+    def test_journal_recovered_after_restart(self, mapping_actions_class):
+        log_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, log_path)
+        journal_config = runtime_config(**{"JOURNAL.ENABLED": True})
+        self._instance._journal = MappingJournal(Mock(), journal_config, log_path=log_path)
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        mapping_actions_class.return_value.map_bidi.return_value = "ACCEPTED  set con 1 c:2"
+        mapping_actions_class.return_value.map_clear.return_value = "ACCEPTED  set term 1 c"
+
+        self._instance.map_bidi("192.168.42.240/1/2", "192.168.42.240/1/c")
+        self._instance._journal.close()
+        self._instance._journal = MappingJournal(Mock(), journal_config, log_path=log_path)
+
+        self.assertEqual(self._instance.journal_connections("192.168.42.240").slots, {1: {"C": 2}})
+        self._instance.map_clear_to("192.168.42.240/1/2", ["192.168.42.240/1/c"])
+        changes = self._instance.connection_changes("192.168.42.240", 1)
+        self.assertEqual([(record.sequence, record.out_port, record.in_port) for record in changes], [(2, "C", 0)])
+        self._instance._journal.close()
+
+    def test_journal_connections_disabled(self):
+        self.assertRaises(Exception, self._instance.journal_connections, "192.168.42.240")
+        self.assertEqual(self._instance.connection_changes("192.168.42.240"), [])
+
+    @patch("telebyte.driver_commands.MappingActions")
+    def test_map_bidi_validates_before_sending(self, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.add_slot("192.168.42.240", 2, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+
+        self.assertRaises(InvalidConnectionException, self._instance.map_bidi,
+                          "192.168.42.240/1/A", "192.168.42.240/2/1")
+        self.assertRaises(InvalidConnectionException, self._instance.map_bidi,
+                          "192.168.42.240/1/A", "192.168.42.240/1/B")
+        self.assertRaises(InvalidPortException, self._instance.map_bidi,
+                          "192.168.42.240/1/A", "192.168.42.240/1/3")
+        mapping_actions_class.return_value.map_bidi.assert_not_called()
+
+    @patch("telebyte.driver_commands.MappingActions")
+    def test_map_clear_to_numeric_source(self, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+
+        self._instance.map_clear_to("192.168.42.240/1/1", ["192.168.42.240/1/B"])
+
+        mapping_actions_class.return_value.map_clear.assert_called_once_with(slot_id=1, port="B")
+
+    def test_get_attribute_value_optical_power(self):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        self._instance._optical_sampler.enabled = True
+        self._instance._optical_sampler.read_slot = Mock(return_value={"A": (-3.25, -1.5, 1310.0)})
+
+        response = self._instance.get_attribute_value("192.168.42.240/1/a", "Rx Power (dBm)")
+
+        self.assertEqual(response.build_xml_node().find("Value").text, "-3.25")
+        self._instance._optical_sampler.read_slot.assert_called_once_with(
+            self._instance._cli_handler.default_mode_service.return_value.__enter__.return_value, 1)
+
+    def test_get_attribute_value_sampler_disabled(self):
+        self._instance._cli_handler = MagicMock()
+        self._instance._optical_sampler.read_slot = Mock()
+
+        self.assertRaises(NotImplementedError, self._instance.get_attribute_value, "192.168.42.240/1/a",
+                          "Rx Power (dBm)")
+        self._instance._optical_sampler.read_slot.assert_not_called()
+
+    @patch("telebyte.driver_commands.MappingActions")
+    @patch("telebyte.driver_commands.AutoloadActions")
+    def test_restore_connections_changes_only(self, autoload_actions_class, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        autoload_actions_class.return_value.get_slot_connections.return_value = {"A": 1, "B": 2, "C": 0}
+        mapping_actions_class.return_value.map_batch.return_value = ["ACCEPTED  set term 1 b",
+                                                                     "ACCEPTED  set con 1 c:2"]
+
+        changed = self._instance.restore_connections(ConnectionSnapshot("192.168.42.240", {1: {"A": 1, "C": 2}}))
+
+        self.assertEqual(changed, {1: 2})
+        mapping_actions_class.return_value.map_batch.assert_called_once_with(slot_id=1, changes=[("B", 0), ("C", 2)])
+
+    @patch("telebyte.driver_commands.MappingActions")
+    @patch("telebyte.driver_commands.AutoloadActions")
+    def test_restore_connections_missing_slot(self, autoload_actions_class, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        autoload_actions_class.return_value.get_slot_connections.return_value = {"A": 0}
+        mapping_actions_class.return_value.map_batch.return_value = ["ACCEPTED  set con 1 a:1"]
+
+        self.assertRaises(InvalidConnectionException, self._instance.restore_connections,
+                          ConnectionSnapshot("192.168.42.240", {1: {"A": 1}, 2: {"A": 1}}))
+        mapping_actions_class.return_value.map_batch.assert_called_once_with(slot_id=1, changes=[("A", 1)])
+
+    @patch("telebyte.driver_commands.MappingActions")
+    @patch("telebyte.driver_commands.AutoloadActions")
+    def test_restore_connections_failed_not_counted(self, autoload_actions_class, mapping_actions_class):
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        autoload_actions_class.return_value.get_slot_connections.return_value = {"A": 0, "B": 0}
+        mapping_actions_class.return_value.map_batch.return_value = ["ACCEPTED  set con 1 a:1",
+                                                                     "ERROR  Port is locked"]
+
+        with self.assertRaises(InvalidConnectionException) as context:
+            self._instance.restore_connections(ConnectionSnapshot("192.168.42.240",
+                                                                  {1: {"A": 1, "B": 2, "Z": 1}}))
+        self.assertIn("1 changed", str(context.exception))
+
+    @patch("telebyte.driver_commands.MappingActions")
+    @patch("telebyte.driver_commands.AutoloadActions")
+    def test_restore_connections_batches(self, autoload_actions_class, mapping_actions_class):
+        self._instance._restore_batch = 2
+        self._instance._port_index.add_slot("192.168.42.240", 1, 16, 2)
+        self._instance._port_index.mark_indexed("192.168.42.240")
+        self._instance._cli_handler = MagicMock()
+        autoload_actions_class.return_value.get_slot_connections.return_value = {}
+        mapping_actions_class.return_value.map_batch.side_effect = lambda slot_id, changes: [
+            "ACCEPTED"] * len(changes)
+
+        changed = self._instance.restore_connections(ConnectionSnapshot("192.168.42.240",
+                                                                        {1: {"A": 1, "B": 1, "C": 2}}))
+
+        self.assertEqual(changed, {1: 3})
+        self.assertEqual([call_args[1]["changes"] for call_args in
+                          mapping_actions_class.return_value.map_batch.call_args_list],
+                         [[("A", 1), ("B", 1)], [("C", 2)]])
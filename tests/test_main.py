@@ -2,7 +2,8 @@ from unittest import TestCase
 
 from mock import patch, Mock, call
 
-from main import Main
+from main import Main, START_TIME
+from tests import runtime_config
 
 
 class TestMain(TestCase):
@@ -29,6 +30,7 @@ class TestMain(TestCase):
         self.assertIs(instance._driver_path, self._driver_path)
         self.assertIs(instance._log_path, self._log_path)
         self.assertIs(os_mod.environ.get('LOG_PATH'), self._log_path)
+        self.assertEqual(instance._startup_report._start_time, START_TIME)
 
     @patch('main.os')
     @patch('main.sys')
@@ -60,9 +62,8 @@ class TestMain(TestCase):
         config_path = Mock()
         xml_log_path = Mock()
         os_mod.path.join.side_effect = [config_path, xml_log_path]
-        runtime_config_instance = Mock()
         log_level = Mock()
-        runtime_config_instance.read_key.return_value = log_level
+        runtime_config_instance = runtime_config(**{'LOGGING.LEVEL': log_level})
         runtime_configuration_class.return_value = runtime_config_instance
         xml_logger_inst = Mock()
         xml_logger_class.return_value = xml_logger_inst
@@ -95,10 +96,40 @@ class TestMain(TestCase):
         xml_logger_class.assert_called_once_with(xml_log_path)
         get_qs_logger_mod.assert_called_once_with(log_group=driver_name, log_file_prefix=driver_name + '_commands',
                                                   log_category='COMMANDS')
-        runtime_config_instance.read_key.assert_called_once_with('LOGGING.LEVEL', 'INFO')
+        runtime_config_instance.read_key.assert_any_call('LOGGING.LEVEL', 'INFO')
+        runtime_config_instance.read_key.assert_any_call('DRIVER.WORKERS', 0)
         command_logger.setLevel.assert_called_once_with(log_level)
         importlib_mod.import_module.assert_called_once_with('{}.driver_commands'.format(driver_name), package=None)
         driver_commands_mod.DriverCommands.assert_called_once_with(command_logger, runtime_config_instance)
         command_executor_class.assert_called_once_with(driver_commands_inst, command_logger)
         driver_listener_class.assert_called_once_with(command_executor_inst, xml_logger_inst, command_logger)
         server_inst.start_listening.assert_called_once_with(port=self._port)
+
+    @patch('main.os')
+    @patch('main.importlib')
+    @patch('main.RuntimeConfiguration')
+    @patch('main.XMLLogger')
+    @patch('main.get_qs_logger')
+    @patch('main.ShardedCommandExecutor')
+    @patch('main.CommandExecutor')
+    @patch('main.DriverListener')
+    def test_run_driver_workers(self, driver_listener_class, command_executor_class, sharded_executor_class,
+                                get_qs_logger_mod, xml_logger_class, runtime_configuration_class, importlib_mod,
+                                os_mod):
+        config_path = Mock()
+        os_mod.path.join.return_value = config_path
+        runtime_config_instance = runtime_config(**{'DRIVER.WORKERS': 4})
+        runtime_configuration_class.return_value = runtime_config_instance
+        command_logger = Mock()
+        get_qs_logger_mod.return_value = command_logger
+        sharded_executor_inst = Mock()
+        sharded_executor_class.return_value = sharded_executor_inst
+        driver_name = 'test driver'
+
+        self._instance.run_driver(driver_name)
+
+        sharded_executor_class.assert_called_once_with(driver_name, config_path, self._log_path, 4, command_logger)
+        importlib_mod.import_module.assert_not_called()
+        command_executor_class.assert_not_called()
+        driver_listener_class.assert_called_once_with(sharded_executor_inst, xml_logger_class.return_value,
+                                                      command_logger)
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Export and restore chassis cross-connect configuration
+
+Export saves connection tables of all slots to a snapshot file, restore applies it back changing only
+the connections different from the snapshot ones. Changes of a slot are sent in batches of DRIVER.RESTORE_BATCH
+commands. Slots are restored in parallel only with CLI.SESSIONS over 1, up to CLI.SESSIONS at once.
+Password is taken from --password, TELEBYTE_PASSWORD environment variable or asked for.
+
+With --journal the connections recovered from the driver mapping journal are used instead of the device
+(export) or the snapshot file (restore), e.g. to bring back the last known connections after the chassis
+lost its configuration. The journal has a single writer, run it while the driver is stopped.
+
+    python tools/connection_snapshot.py export --address 192.168.42.240 --file chassis.con
+    python tools/connection_snapshot.py restore --file chassis.con
+    python tools/connection_snapshot.py restore --journal --address 192.168.42.240
+"""
+
+import argparse
+import getpass
+import logging
+import os
+import sys
+import time
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration  # noqa: E402
+
+from telebyte.driver_commands import DriverCommands  # noqa: E402
+from telebyte.helpers.connection_snapshot import ConnectionSnapshot  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Telebyte chassis connections export and restore")
+    parser.add_argument("action", choices=["export", "restore"])
+    parser.add_argument("--file", help="snapshot file, not used by restore with --journal")
+    parser.add_argument("--journal", action="store_true", help="use the connections of the mapping journal")
+    parser.add_argument("--logs", default=os.environ.get("LOG_PATH", os.path.join(ROOT_PATH, "..", "Logs")),
+                        help="driver logs folder with the mapping journal")
+    parser.add_argument("--address", help="chassis address, taken from the snapshot file on restore by default")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default=os.environ.get("TELEBYTE_PASSWORD"),
+                        help="TELEBYTE_PASSWORD environment variable by default, asked for if it is not set")
+    parser.add_argument("--config", default=os.path.join(ROOT_PATH, "telebyte_runtime_config.yml"),
+                        help="runtime configuration file")
+    args = parser.parse_args(argv)
+    if not args.file and not (args.action == "restore" and args.journal):
+        parser.error("--file is required")
+    password = args.password if args.password is not None else getpass.getpass("{} password: ".format(args.username))
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    logger = logging.getLogger("telebyte")
+    runtime_config = RuntimeConfiguration(args.config)
+    os.environ["LOG_PATH"] = args.logs
+
+    snapshot = None
+    address = args.address
+    if args.action == "restore" and not args.journal:
+        snapshot = ConnectionSnapshot.load(args.file)
+        if address:
+            snapshot.address = address
+        address = snapshot.address
+    if not address:
+        parser.error("--address is required for export and journal restore")
+
+    driver = DriverCommands(logger, runtime_config)
+    driver.login(address, args.username, password)
+
+    start_time = time.time()
+    if args.journal:
+        snapshot = driver.journal_connections(address)
+    if args.action == "export":
+        snapshot = snapshot or driver.export_connections(address)
+        snapshot.save(args.file)
+        logger.info("Exported {} connections of {} slots in {:.1f}s".format(
+            sum(len(connections) for connections in snapshot.slots.values()), len(snapshot.slots),
+            time.time() - start_time))
+    else:
+        changed = driver.restore_connections(snapshot)
+        logger.info("Restored {} slots in {:.1f}s, changed connections: {}".format(
+            len(changed), time.time() - start_time, sum(changed.values())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Load test of the driver listener and command executor
+
+Sends a mix of L1 requests (autoload, map_bidi, map_clear, get_state_id) from concurrent clients
+over local sockets and reports throughput, latency percentiles and queueing. By default the driver
+is started in this process and backed by the simulated chassis (SIMULATOR session type).
+
+    python tools/load_test.py --clients 10 --duration 60
+    python tools/load_test.py --no-driver --port 1024 --address 192.168.42.240
+"""
+
+import argparse
+import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import yaml
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_PATH)
+
+from telebyte.helpers.port_index import PortIndex  # noqa: E402
+
+REQUEST_NAMESPACE = "http://schemas.qualisystems.com/ResourceManagement/DriverCommands.xsd"
+RESPONSE_END = "</Responses>"
+DEFAULT_MIX = "autoload=1,map_bidi=10,map_clear=10,get_state_id=20"
+
+
+def command_xml(command_name, **params):
+    parameters = "".join("<{0}>{1}</{0}>".format(key, value) for key, value in params.items())
+    return '<Command CommandName="{}" CommandId="{}"><Parameters>{}</Parameters></Command>'.format(
+        command_name, uuid.uuid4(), parameters)
+
+
+def request_xml(*commands):
+    return '<Commands xmlns="{}">{}</Commands>\r\n'.format(REQUEST_NAMESPACE, "".join(commands))
+
+
+class RequestFactory(object):
+    """ Build requests of the realistic mix, every request logs in first as CloudShell does """
+
+    def __init__(self, addresses, username, password, slots, mix):
+        """
+        :param slots: slot ID, out ports count, in ports count of each installed slot
+        """
+
+        self._addresses = addresses
+        self._username = username
+        self._password = password
+        self._slots = slots
+        self._operations = []
+        for item in mix.split(","):
+            name, weight = item.split("=")
+            self._operations.extend([name.strip()] * int(weight))
+
+    @staticmethod
+    def _out_port(address, slot):
+        slot_id, out_ports, _ = slot
+        return "{}/{}/{}".format(address, slot_id, PortIndex.out_port_name(random.randint(1, out_ports)))
+
+    @staticmethod
+    def _in_port(address, slot):
+        slot_id, _, in_ports = slot
+        return "{}/{}/{}".format(address, slot_id, random.randint(1, in_ports))
+
+    def build(self):
+        operation = random.choice(self._operations)
+        address = random.choice(self._addresses)
+        slot = random.choice(self._slots)
+        if operation == "autoload":
+            command = command_xml("GetResourceDescription", Address=address)
+        elif operation == "map_bidi":
+            command = command_xml("MapBidi", MapPort_A=self._out_port(address, slot),
+                                  MapPort_B=self._in_port(address, slot))
+        elif operation == "map_clear":
+            command = command_xml("MapClear", MapPort=self._out_port(address, slot))
+        elif operation == "get_state_id":
+            command = command_xml("GetStateId")
+        else:
+            raise ValueError("Unknown operation {}".format(operation))
+        login = command_xml("Login", Address=address, User=self._username, Password=self._password)
+        return operation, request_xml(login, command)
+
+
+class Statistics(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finished(self, operation, latency, success):
+        with self._lock:
+            self.in_flight -= 1
+            self.latencies[operation].append(latency)
+            if not success:
+                self.errors[operation] += 1
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+
+def send_request(connection, request):
+    connection.sendall(request.encode("utf-8"))
+    response = b""
+    while RESPONSE_END.encode("utf-8") not in response:
+        data = connection.recv(4096)
+        if not data:
+            raise IOError("Connection closed by driver")
+        response += data
+    return response.decode("utf-8")
+
+
+def run_client(host, port, factory, statistics, stop_time, requests_left):
+    connection = socket.create_connection((host, port))
+    try:
+        while time.time() < stop_time:
+            with requests_left["lock"]:
+                if requests_left["count"] is not None:
+                    if requests_left["count"] <= 0:
+                        break
+                    requests_left["count"] -= 1
+
+            operation, request = factory.build()
+            statistics.started()
+            start_time = time.time()
+            try:
+                response = send_request(connection, request)
+                success = not re.search(r'Success="false"', response)
+            except (IOError, socket.error):
+                success = False
+                connection.close()
+                connection = socket.create_connection((host, port))
+            statistics.finished(operation, time.time() - start_time, success)
+    finally:
+        connection.close()
+
+
+def start_driver(port, slots, latency, workers, sessions, trace=False):
+    """ Start driver with simulated chassis in a daemon thread """
+
+    driver_path = tempfile.mkdtemp(prefix="telebyte_load_test_")
+    config = {"CLI": {"TYPE": ["SIMULATOR"], "PORTS": {}, "SESSIONS": sessions,
+                      "SIMULATOR": {"SLOTS": slots, "LATENCY": latency}},
+              "LOGGING": {"LEVEL": "WARNING"},
+              "DRIVER": {"WORKERS": workers},
+              "TRACING": {"ENABLED": trace}}
+    with open(os.path.join(driver_path, "telebyte_runtime_config.yml"), "w") as config_file:
+        yaml.safe_dump(config, config_file)
+
+    from main import Main
+    driver = Main(os.path.join(driver_path, "main.py"), port, os.path.join(driver_path, "Logs"))
+    thread = threading.Thread(target=driver.run_driver, args=("telebyte",))
+    thread.daemon = True
+    thread.start()
+
+    start_time = time.time()
+    while time.time() - start_time < 30:
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return driver_path
+        except socket.error:
+            time.sleep(0.1)
+    raise RuntimeError("Driver did not start listening on port {}".format(port))
+
+
+def report(statistics, elapsed):
+    total = sum(len(values) for values in statistics.latencies.values())
+    print("Requests: {}, errors: {}, elapsed: {:.1f}s, throughput: {:.2f} req/s".format(
+        total, sum(statistics.errors.values()), elapsed, total / elapsed if elapsed else 0))
+    print("Concurrency: max in flight {}, average in flight {:.2f}".format(
+        statistics.max_in_flight, sum(sum(values) for values in statistics.latencies.values()) / elapsed))
+    print("")
+    print("{:<14}{:>8}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}{:>12}".format(
+        "operation", "count", "errors", "min", "p50", "p90", "p99", "max", "queue avg"))
+    for operation, values in sorted(statistics.latencies.items()):
+        # the fastest response approximates service time, the rest is time spent waiting
+        queue_avg = sum(values) / len(values) - min(values)
+        print("{:<14}{:>8}{:>8}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>10.3f}{:>12.3f}".format(
+            operation, len(values), statistics.errors[operation], min(values), percentile(values, 50),
+            percentile(values, 90), percentile(values, 99), max(values), queue_avg))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Telebyte L1 driver load test")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1024)
+    parser.add_argument("--no-driver", action="store_true", help="use already running driver")
+    parser.add_argument("--address", default="192.168.42.240", help="chassis addresses, comma separated")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--slots", default="600-SM-16-1-2", help="simulated module P/N per slot, comma separated")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated device seconds per command")
+    parser.add_argument("--workers", type=int, default=0, help="driver worker processes")
+    parser.add_argument("--sessions", type=int, default=4, help="driver CLI sessions")
+    parser.add_argument("--trace", action="store_true", help="save driver request traces")
+    parser.add_argument("--clients", type=int, default=10, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="total requests, overrides duration")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights")
+    args = parser.parse_args(argv)
+
+    slots = args.slots.split(",")
+    if not args.no_driver:
+        driver_path = start_driver(args.port, slots, args.latency, args.workers, args.sessions, args.trace)
+        print("Driver started, logs: {}".format(driver_path))
+
+    installed_slots = []
+    for slot_id, model in enumerate(slots, 1):
+        match = re.search(r"(?P<out_ports>\d+)-\d+-(?P<in_ports>\d+)", model)
+        if match:
+            installed_slots.append((slot_id, int(match.group("out_ports")), int(match.group("in_ports"))))
+    factory = RequestFactory(args.address.split(","), args.username, args.password, installed_slots, args.mix)
+
+    statistics = Statistics()
+    requests_left = {"lock": threading.Lock(), "count": args.requests}
+    stop_time = time.time() + (args.duration if args.requests is None else float("inf"))
+    start_time = time.time()
+    clients = [threading.Thread(target=run_client,
+                                args=(args.host, args.port, factory, statistics, stop_time, requests_left))
+               for _ in range(args.clients)]
+    for client in clients:
+        client.daemon = True
+        client.start()
+    for client in clients:
+        client.join()
+
+    report(statistics, time.time() - start_time)
+
+    if not args.no_driver:
+        # let the driver close client connections before the interpreter exits
+        from cloudshell.layer_one.core.connection_handler import ConnectionHandler
+        for thread in threading.enumerate():
+            if isinstance(thread, ConnectionHandler):
+                thread.join(1)
+
+
+if __name__ == "__main__":
+    main()